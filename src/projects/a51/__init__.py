@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+A5/1 cipher import
+
+@authors:
+@version: 2025.3
+"""
+
+from .a51_cipher import A51Stream, decrypt, decrypt_file, encrypt, encrypt_file
+
+__all__ = ["A51Stream", "encrypt", "decrypt", "encrypt_file", "decrypt_file"]
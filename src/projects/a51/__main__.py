@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Bulk A5/1 encryption and decryption of files and directories
+
+Usage: python -m src.projects.a51 {encrypt,decrypt} SECRET PATH [PATH ...]
+
+@authors:
+@version: 2025.3
+"""
+
+import argparse
+import glob
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from . import a51_cipher as a51
+
+SUFFIXES = {"encrypt": ".secret", "decrypt": ".txt"}
+CIPHERTEXT_SUFFIXES = (".bin", ".secret")
+
+
+def wanted(path: Path, command: str | None) -> bool:
+    """Whether a file found in a directory or by a glob is an input of a command
+
+    Decryption takes the ciphertexts (.bin, .secret) and encryption everything
+    else except checkpoint files, so a directory that holds both plaintexts and
+    ciphertexts does not map two inputs onto one output.
+
+    :param path: file
+    :param command: encrypt, decrypt, or None for every file
+    """
+    if command == "decrypt":
+        return path.suffix in CIPHERTEXT_SUFFIXES
+    if command == "encrypt":
+        return path.suffix not in (*CIPHERTEXT_SUFFIXES, ".ckpt")
+    return True
+
+
+def collect_files(patterns: list[str], command: str | None = None) -> list[Path]:
+    """Expand directories and glob patterns into a sorted list of files
+
+    :param patterns: files, directories, or glob patterns
+    :param command: only expand to the inputs of this command (see `wanted`); files named explicitly are always kept
+    :return: files to process
+    """
+    files = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            files.update(child for child in path.iterdir() if child.is_file() and wanted(child, command))
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(
+                Path(match)
+                for match in glob.glob(pattern, recursive=True)
+                if Path(match).is_file() and wanted(Path(match), command)
+            )
+    return sorted(files)
+
+
+def destination_for(source: Path, command: str, output: Path | None) -> Path:
+    """Output file for a source file
+
+    :param source: input file
+    :param command: encrypt or decrypt
+    :param output: output directory (if None, next to the source)
+    :return: output file
+    """
+    name = source.with_suffix(SUFFIXES[command]).name
+    return (output or source.parent) / name
+
+
+def process_file(command: str, source: Path, secret: str, destination: Path, frames: bool) -> tuple[Path, int, float]:
+    """Encrypt or decrypt a single file
+
+    :return: the source, its size in bytes, and the elapsed time in seconds
+    """
+    started = time.perf_counter()
+    if command == "encrypt":
+        a51.encrypt_file(source, secret, destination, frames=frames, workers=1)
+    else:
+        a51.decrypt_file(source, secret, destination, frames=frames, workers=1)
+    return source, source.stat().st_size, time.perf_counter() - started
+
+
+def megabytes_per_second(size: int, seconds: float) -> float:
+    """Throughput in MB/s"""
+    return size / 1e6 / seconds if seconds else 0.0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(prog="python -m src.projects.a51", description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=sorted(SUFFIXES))
+    parser.add_argument("secret")
+    parser.add_argument("paths", nargs="+", help="files, directories, or glob patterns")
+    parser.add_argument("-o", "--output", type=Path, help="output directory (default: next to each file)")
+    parser.add_argument("-j", "--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--frames", action="store_true", help="use the GSM frame mode")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths, args.command)
+    if not files:
+        parser.error("no files to process")
+    destinations = [destination_for(source, args.command, args.output) for source in files]
+    if len({destination.resolve() for destination in destinations}) != len(destinations):
+        parser.error("several files would be written to the same destination")
+    for source, destination in zip(files, destinations):
+        if destination.resolve() == source.resolve():
+            parser.error(f"{source} would be overwritten by its own output")
+
+    started, total = time.perf_counter(), 0
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [
+            pool.submit(process_file, args.command, source, args.secret, destination, args.frames)
+            for source, destination in zip(files, destinations)
+        ]
+        for future in as_completed(futures):
+            source, size, seconds = future.result()
+            total += size
+            print(f"{source}: {size:,} bytes in {seconds:.3f} s ({megabytes_per_second(size, seconds):.2f} MB/s)")
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(files)} files, {total:,} bytes in {elapsed:.3f} s ({megabytes_per_second(total, elapsed):.2f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
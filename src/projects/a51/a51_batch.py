@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Batch A5/1 keystream generation for many keys at once
+
+@authors:
+@version: 2025.3
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from . import a51_cipher as a51
+except ImportError:
+    import a51_cipher as a51
+
+
+def populate_registers_batch(secrets: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Populate the registers of many secrets
+
+    Same layout as `a51_cipher.populate_registers_packed`: only the first 64 bits
+    (8 characters) of a secret are used and shorter secrets are padded with zeros.
+
+    :param secrets: secrets made of characters up to U+00FF
+    :return: registers X, Y, Z as arrays with one element per secret
+    """
+    keys = np.frombuffer(
+        b"".join(secret.encode("latin-1")[:8].ljust(8, b"\0") for secret in secrets), dtype=np.uint8
+    ).reshape(len(secrets), 8)
+    bits = np.unpackbits(keys, axis=1).astype(np.uint32)
+
+    def pack(start: int, stop: int) -> np.ndarray:
+        return (bits[:, start:stop] << np.arange(stop - start, dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+
+    return pack(0, a51.X_BITS), pack(a51.X_BITS, a51.X_BITS + a51.Y_BITS), pack(a51.X_BITS + a51.Y_BITS, 64)
+
+
+def generate_keystream_batch(
+    length: int, x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Generate keystream bytes for many register states at once
+
+    Every clock is computed element-wise over all states, so the Python loop
+    runs 8 * length times no matter how many keys are in the batch.
+
+    :param length: number of keystream bytes per key
+    :param x: X registers
+    :param y: Y registers
+    :param z: Z registers
+    :return: K x length keystream matrix and the registers X, Y, Z after the last clock
+    """
+    x, y, z = (np.asarray(r, dtype=np.uint32).copy() for r in (x, y, z))
+    keystream = np.zeros((len(x), length), dtype=np.uint8)
+    byte = np.zeros(len(x), dtype=np.uint8)
+
+    for i in range(length):
+        byte[:] = 0
+        for _ in range(8):
+            x_bit, y_bit, z_bit = (x >> a51.X_CLOCK) & 1, (y >> a51.Y_CLOCK) & 1, (z >> a51.Z_CLOCK) & 1
+            maj = (x_bit & y_bit) | (x_bit & z_bit) | (y_bit & z_bit)
+
+            x_feedback = ((x >> 13) ^ (x >> 16) ^ (x >> 17) ^ (x >> 18)) & 1
+            y_feedback = ((y >> 20) ^ (y >> 21)) & 1
+            z_feedback = ((z >> 7) ^ (z >> 20) ^ (z >> 21) ^ (z >> 22)) & 1
+            x = np.where(x_bit == maj, ((x << 1) | x_feedback) & a51.X_MASK, x)
+            y = np.where(y_bit == maj, ((y << 1) | y_feedback) & a51.Y_MASK, y)
+            z = np.where(z_bit == maj, ((z << 1) | z_feedback) & a51.Z_MASK, z)
+
+            byte <<= 1
+            byte |= ((x >> (a51.X_BITS - 1)) ^ (y >> (a51.Y_BITS - 1)) ^ (z >> (a51.Z_BITS - 1))).astype(np.uint8)
+        keystream[:, i] = byte
+
+    return keystream, (x, y, z)
+
+
+def find_matches(secrets: Sequence[str], keystream: bytes) -> list[str]:
+    """Find the secrets that produce a known keystream
+
+    :param secrets: candidate secrets
+    :param keystream: known keystream bytes
+    :return: matching secrets in their original order
+    """
+    generated, _ = generate_keystream_batch(len(keystream), *populate_registers_batch(secrets))
+    matches = (generated == np.frombuffer(keystream, dtype=np.uint8)).all(axis=1)
+    return [secret for secret, match in zip(secrets, matches) if match]
+
+
+def main():
+    """Main function"""
+    secrets = ["freedom", "militia", "soldier", "seizure", "jeopardy"]
+    keystream, _ = generate_keystream_batch(8, *populate_registers_batch(secrets))
+    for secret, row in zip(secrets, keystream):
+        print(f"{secret:>10}: {bytes(row).hex()}")
+
+
+if __name__ == "__main__":
+    main()
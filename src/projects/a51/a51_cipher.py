@@ -6,8 +6,40 @@ A5/1 cipher implementation
 @version: 2025.3
 """
 
+import collections
+import hashlib
+import hmac
+import multiprocessing
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    from .. import fileio
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    import fileio
+
+Buffer = bytes | bytearray | memoryview
+
+X_BITS, Y_BITS, Z_BITS = 19, 22, 23
+X_MASK, Y_MASK, Z_MASK = (1 << X_BITS) - 1, (1 << Y_BITS) - 1, (1 << Z_BITS) - 1
+X_TAPS = (1 << 13) | (1 << 16) | (1 << 17) | (1 << 18)
+Y_TAPS = (1 << 20) | (1 << 21)
+Z_TAPS = (1 << 7) | (1 << 20) | (1 << 21) | (1 << 22)
+X_CLOCK, Y_CLOCK, Z_CLOCK = 8, 10, 10
+CHUNK_SIZE = 1 << 16
+CHECKPOINT_MAGIC = b"A51C"
+CHECKPOINT_HEADER = struct.Struct("<4sII")
+CHECKPOINT_RECORD = struct.Struct("<III")
+CHECKPOINT_MAC_SIZE = hashlib.sha256().digest_size
+FRAME_BITS = 228
+FRAME_COUNT = 1 << 22
+FRAME_WARMUP = 100
+FRAME_PAIR_BYTES = 2 * FRAME_BITS // 8
+FRAME_BLOCK_SIZE = FRAME_PAIR_BYTES * 256
+
 
 def majority(x8_bit: int, y10_bit: int, z10_bit: int) -> int:
     """Return the majority bit
@@ -61,27 +93,196 @@ def generate_bit(x: list[int], y: list[int], z: list[int]) -> int:
     return x[18] ^ y[21] ^ z[22]
 
 
+def pack_register(register: list[int]) -> int:
+    """Pack a register into an integer
+
+    Bit i of the result holds register[i], so the output bit of X is bit 18.
+
+    :param register: register as a list of bits
+    :return: register as an integer
+    """
+    value = 0
+    for i, bit in enumerate(register):
+        value |= bit << i
+    return value
+
+
+def unpack_register(value: int, length: int) -> list[int]:
+    """Unpack an integer into a register
+
+    :param value: register as an integer
+    :param length: number of bits in the register
+    :return: register as a list of bits
+    """
+    return [(value >> i) & 1 for i in range(length)]
+
+
+def clock_packed(x: int, y: int, z: int) -> tuple[int, int, int]:
+    """Clock the packed registers once using the majority rule
+
+    :param x: X register as an integer
+    :param y: Y register as an integer
+    :param z: Z register as an integer
+    :return: registers X, Y, Z after clocking
+    """
+    x_bit, y_bit, z_bit = (x >> X_CLOCK) & 1, (y >> Y_CLOCK) & 1, (z >> Z_CLOCK) & 1
+    maj = (x_bit & y_bit) | (x_bit & z_bit) | (y_bit & z_bit)
+
+    if x_bit == maj: x = ((x << 1) | ((x & X_TAPS).bit_count() & 1)) & X_MASK
+    if y_bit == maj: y = ((y << 1) | ((y & Y_TAPS).bit_count() & 1)) & Y_MASK
+    if z_bit == maj: z = ((z << 1) | ((z & Z_TAPS).bit_count() & 1)) & Z_MASK
+
+    return x, y, z
+
+
 def generate_keystream(plaintext_chars: int, x: list[int], y: list[int], z: list[int]) -> list[int]:
     """Generate stream of bits to match length of plaintext
 
+    The registers are packed into integers, run through the table engine of
+    `generate_keystream_bytes` and written back afterwards, so the lists end
+    up in the same state as if they had been stepped one bit at a time.
+
+    Every clock depends on the one before, so under CPython this is only two
+    to three times faster than stepping the lists; code that can work on bytes
+    should call `generate_keystream_bytes` and skip the bit list.
+
     :param plaintext: plaintext to be encrypted
     :param x: X register
     :param y: Y register
     :param z: Z register
     :return: keystream of the same length as the plaintext
     """
-    keystream = []
-    for _ in range(0, plaintext_chars * 8):
-        maj = majority(x[8], y[10], z[10])
+    keystream, (x_packed, y_packed, z_packed) = generate_keystream_bytes(
+        plaintext_chars, pack_register(x), pack_register(y), pack_register(z)
+    )
+    x[:] = unpack_register(x_packed, len(x))
+    y[:] = unpack_register(y_packed, len(y))
+    z[:] = unpack_register(z_packed, len(z))
 
-        if x[8] == maj: step_x(x)
-        if y[10] == maj: step_y(y)
-        if z[10] == maj: step_z(z)
+    return list(b"".join(map(BYTE_BITS.__getitem__, keystream)))
 
-        keystream.append(generate_bit(x, y, z))
 
-    return keystream
 
+def _build_schedule_table() -> tuple[tuple[int, ...], ...]:
+    """Build the majority schedule for four clocks
+
+    The table is indexed by the next four clocking bits of X, Y, and Z (4 bits each,
+    the bit examined first in the most significant position). Every entry holds, for
+    X, Y, and Z in turn, the step pattern shifted into place for `OUTPUT_TABLE`
+    (bit 3 - t of the pattern is set if the register steps on clock t), the step
+    count, and the step count shifted into place for the register's feedback table.
+    """
+    table = []
+    for index in range(1 << 12):
+        windows = ((index >> 8) & 0xF, (index >> 4) & 0xF, index & 0xF)
+        counts, patterns = [0, 0, 0], [0, 0, 0]
+        for t in range(4):
+            bits = [(window >> (3 - count)) & 1 for window, count in zip(windows, counts)]
+            maj = majority(*bits)
+            for r in range(3):
+                if bits[r] == maj:
+                    counts[r] += 1
+                    patterns[r] |= 1 << (3 - t)
+        table.append(
+            (
+                *(pattern << 5 for pattern in patterns),
+                *counts,
+                counts[0] << 9,
+                counts[1] << 5,
+                counts[2] << 10,
+            )
+        )
+    return tuple(table)
+
+
+def _build_output_table() -> tuple[int, ...]:
+    """Build the output nibble table for four clocks
+
+    The table is indexed by a step pattern (4 bits) and the five most significant
+    bits of a register; the entry holds the four output bits the register produces.
+    """
+    table = []
+    for index in range(1 << 9):
+        pattern, window = index >> 5, index & 0x1F
+        count, nibble = 0, 0
+        for t in range(4):
+            count += (pattern >> (3 - t)) & 1
+            nibble |= ((window >> (4 - count)) & 1) << (3 - t)
+        table.append(nibble)
+    return tuple(table)
+
+
+def _build_feedback_table(taps: int, positions: tuple[int, ...]) -> tuple[int, ...]:
+    """Build the table of feedback bits for up to four steps of a register
+
+    Over four steps the feedback only depends on the original register bits, so
+    the table is indexed by the step count and a window of those bits (bit k of
+    the window is register bit positions[k]). The entry holds the feedback bits
+    of the first `count` steps, ready to be OR-ed into the shifted register.
+
+    :param taps: feedback taps of the register
+    :param positions: register bits that make up the window
+    """
+    table = []
+    for count in range(5):
+        for window in range(1 << len(positions)):
+            register, feedback = 0, 0
+            for k, position in enumerate(positions):
+                register |= ((window >> k) & 1) << position
+            for _ in range(4):
+                bit = (register & taps).bit_count() & 1
+                register = (register << 1) | bit
+                feedback = (feedback << 1) | bit
+            table.append(feedback >> (4 - count))
+    return tuple(table)
+
+
+SCHEDULE_TABLE = _build_schedule_table()
+OUTPUT_TABLE = _build_output_table()
+X_FEEDBACK_TABLE = _build_feedback_table(X_TAPS, tuple(range(10, 19)))
+Y_FEEDBACK_TABLE = _build_feedback_table(Y_TAPS, tuple(range(17, 22)))
+Z_FEEDBACK_TABLE = _build_feedback_table(Z_TAPS, (4, 5, 6, 7, *range(17, 23)))
+BYTE_BITS = tuple(bytes((byte >> (7 - i)) & 1 for i in range(8)) for byte in range(256))
+
+
+def generate_keystream_bytes(length: int, x: int, y: int, z: int) -> tuple[bytes, tuple[int, int, int]]:
+    """Generate keystream bytes from packed registers
+
+    Every byte takes two lookups into the precomputed tables, each of them
+    advancing the registers four clocks at once. The first keystream bit is the
+    most significant bit of the first byte, matching `generate_keystream`.
+
+    :param length: number of keystream bytes
+    :param x: X register as an integer
+    :param y: Y register as an integer
+    :param z: Z register as an integer
+    :return: keystream and the registers X, Y, Z after the last clock
+    """
+    schedule, output = SCHEDULE_TABLE, OUTPUT_TABLE
+    x_feedback, y_feedback, z_feedback = X_FEEDBACK_TABLE, Y_FEEDBACK_TABLE, Z_FEEDBACK_TABLE
+    x, y, z = x & X_MASK, y & Y_MASK, z & Z_MASK
+    keystream = bytearray(length)
+
+    for i in range(length):
+        ox, oy, oz, cx, cy, cz, fx, fy, fz = schedule[
+            ((x << 3) & 0xF00) | ((y >> 3) & 0xF0) | ((z >> 7) & 0xF)
+        ]
+        high = output[ox | (x >> 14)] ^ output[oy | (y >> 17)] ^ output[oz | (z >> 18)]
+        x = ((x << cx) | x_feedback[fx | ((x >> 10) & 0x1FF)]) & X_MASK
+        y = ((y << cy) | y_feedback[fy | (y >> 17)]) & Y_MASK
+        z = ((z << cz) | z_feedback[fz | ((z >> 4) & 0xF) | ((z >> 13) & 0x3F0)]) & Z_MASK
+
+        ox, oy, oz, cx, cy, cz, fx, fy, fz = schedule[
+            ((x << 3) & 0xF00) | ((y >> 3) & 0xF0) | ((z >> 7) & 0xF)
+        ]
+        keystream[i] = (high << 4) | (
+            output[ox | (x >> 14)] ^ output[oy | (y >> 17)] ^ output[oz | (z >> 18)]
+        )
+        x = ((x << cx) | x_feedback[fx | ((x >> 10) & 0x1FF)]) & X_MASK
+        y = ((y << cy) | y_feedback[fy | (y >> 17)]) & Y_MASK
+        z = ((z << cz) | z_feedback[fz | ((z >> 4) & 0xF) | ((z >> 13) & 0x3F0)]) & Z_MASK
+
+    return bytes(keystream), (x, y, z)
 
 
 def populate_registers(init_keyword: str) -> tuple[list[int], list[int], list[int]]:
@@ -114,73 +315,514 @@ def populate_registers(init_keyword: str) -> tuple[list[int], list[int], list[in
     return tuple([x_register, y_register, z_register])
 
 
-def xor_with_keystream(bits: str, keystream: list[int]) -> str:
-    return ''.join(str(int(bit) ^ k) for bit, k in zip(bits, keystream))
+def populate_registers_packed(init_keyword: str) -> tuple[int, int, int]:
+    """Populate registers packed into integers
+
+    :param init_keyword: initial secret word that will be used to populate registers X, Y, and Z
+    :return: registers X, Y, Z as integers
+    """
+    bits = "".join(format(ord(char), "08b") for char in init_keyword).ljust(64, "0")
+    return int(bits[18::-1], 2), int(bits[40:18:-1], 2), int(bits[63:40:-1], 2)
+
+
+def keystream_to_bytes(keystream: list[int]) -> bytes:
+    """Pack a keystream of bits into bytes
+
+    :param keystream: keystream as a list of bits, most significant bit first
+    :return: keystream as bytes
+    """
+    packed = bytearray(len(keystream) // 8)
+    for i in range(len(packed)):
+        byte = 0
+        for bit in keystream[8 * i : 8 * i + 8]:
+            byte = (byte << 1) | bit
+        packed[i] = byte
+    return bytes(packed)
+
+
+def xor_bytes(data: Buffer, keystream: Buffer) -> bytes:
+    """XOR data with a keystream
+
+    Works on any object that supports the buffer protocol (bytes, bytearray,
+    memoryview, mmap) without splitting it into bits.
+
+    :param data: plaintext or ciphertext
+    :param keystream: keystream bytes, at least as long as the data
+    :return: data XORed with the keystream
+    :raise: ValueError if the keystream is shorter than the data
+    """
+    length = len(data)
+    keystream = memoryview(keystream)[:length]
+    if len(keystream) < length:
+        raise ValueError(f"keystream of {len(keystream)} bytes is shorter than the data ({length} bytes)")
+    return (int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")).to_bytes(length, "big")
+
+
+def xor_into(data: Buffer, keystream: Buffer, out: Buffer | None = None) -> None:
+    """XOR data with a keystream into a preallocated buffer
+
+    :param data: plaintext or ciphertext
+    :param keystream: keystream bytes, at least as long as the data
+    :param out: writable buffer of at least len(data) bytes (if None, data is overwritten in place)
+    """
+    if out is None:
+        out = data
+    memoryview(out).cast("B")[: len(data)] = xor_bytes(data, keystream)
+
+
+def encrypt_bytes(plaintext: Buffer, keystream: Buffer) -> bytes:
+    """Encrypt raw bytes using A5/1
+
+    :param plaintext: plaintext to be encrypted
+    :param keystream: keystream bytes
+    :return: ciphertext
+    """
+    return xor_bytes(plaintext, keystream)
+
+
+def decrypt_bytes(ciphertext: Buffer, keystream: Buffer) -> bytes:
+    """Decrypt raw bytes using A5/1
+
+    :param ciphertext: ciphertext to be decrypted
+    :param keystream: keystream bytes
+    :return: plaintext
+    """
+    return xor_bytes(ciphertext, keystream)
+
 
 def encrypt(plaintext: str, keystream: list[int]) -> bytes:
     """Encrypt plaintext using A5/1
 
+    Every character is treated as a single byte. Use `encrypt_bytes` for
+    arbitrary (e.g. UTF-8 encoded) data. Characters beyond the end of the
+    keystream are dropped.
+
     :param plaintext: plaintext to be encrypted
     :param keystream: keystream
     :return: ciphertext
+    :raise: ValueError if the plaintext contains characters above U+00FF
     """
-    plaintext_bits = ''.join(format(ord(char), '08b') for char in plaintext)
-    cipher_bits = xor_with_keystream(plaintext_bits, keystream)
-    ciphertext = bytes(int(cipher_bits[i:i+8], 2) for i in range(0, len(cipher_bits), 8))
-    return ciphertext
+    keystream = keystream_to_bytes(keystream)
+    return encrypt_bytes(plaintext[: len(keystream)].encode("latin-1"), keystream)
 
 
 def decrypt(ciphertext: bytes, keystream: list[int]) -> str:
     """Decrypt ciphertext using A5/1
 
+    Every byte is turned into a single character. Use `decrypt_bytes` to get
+    the raw plaintext bytes. Bytes beyond the end of the keystream are dropped.
+
     :param ciphertext: ciphertext to be decrypted
     :param keystream: keystream
     :return: plaintext
     """
-    cipher_bits = ''.join(format(byte, '08b') for byte in ciphertext)
-    plaintext_bits = xor_with_keystream(cipher_bits, keystream)
-    plaintext = ''.join(chr(int(plaintext_bits[i:i+8], 2)) for i in range(0, len(plaintext_bits), 8))
-    return plaintext
+    keystream = keystream_to_bytes(keystream)
+    return decrypt_bytes(ciphertext[: len(keystream)], keystream).decode("latin-1")
+
+
+def populate_registers_frame(init_keyword: str, frame: int) -> tuple[int, int, int]:
+    """Populate packed registers for one GSM frame
+
+    Starting from all-zero registers, the 64 secret bits and then the 22 frame
+    number bits (least significant first) are XOR-ed into bit 0 of every register,
+    each after a regular clock of all three registers. The registers are then
+    clocked 100 times using the majority rule with the output discarded.
+
+    :param init_keyword: secret word (only the first 64 bits are used)
+    :param frame: frame number
+    :return: registers X, Y, Z ready to produce the frame's keystream
+    """
+    if not 0 <= frame < FRAME_COUNT:
+        raise ValueError(f"Frame number must be in [0, {FRAME_COUNT})")
+
+    key_bits = "".join(format(ord(char), "08b") for char in init_keyword).ljust(64, "0")[:64]
+    frame_bits = format(frame, "022b")[::-1]
+    x = y = z = 0
+    for bit in map(int, key_bits + frame_bits):
+        x = (((x << 1) | ((x & X_TAPS).bit_count() & 1)) & X_MASK) ^ bit
+        y = (((y << 1) | ((y & Y_TAPS).bit_count() & 1)) & Y_MASK) ^ bit
+        z = (((z << 1) | ((z & Z_TAPS).bit_count() & 1)) & Z_MASK) ^ bit
+
+    for _ in range(FRAME_WARMUP):
+        x, y, z = clock_packed(x, y, z)
+
+    return x, y, z
+
+
+def generate_frame_keystream(init_keyword: str, frame: int) -> int:
+    """Generate the keystream of one GSM frame
+
+    :param init_keyword: secret word
+    :param frame: frame number
+    :return: FRAME_BITS keystream bits as an integer (first bit most significant)
+    """
+    keystream, _ = generate_keystream_bytes((FRAME_BITS + 7) // 8, *populate_registers_frame(init_keyword, frame))
+    return int.from_bytes(keystream, "big") >> (-FRAME_BITS % 8)
+
+
+def frame_keystream_range(init_keyword: str, offset: int, length: int) -> bytes:
+    """Keystream for a byte range of data encrypted in frame mode
+
+    The data keystream is the concatenation of the frame keystreams, so every
+    two frames cover FRAME_PAIR_BYTES bytes. Only the frames that overlap the
+    range are generated.
+
+    :param init_keyword: secret word
+    :param offset: first byte of the range
+    :param length: number of bytes
+    :return: keystream bytes for the range
+    """
+    if length <= 0:
+        return b""
+
+    first_pair, last_pair = offset // FRAME_PAIR_BYTES, (offset + length - 1) // FRAME_PAIR_BYTES
+    pieces = []
+    for pair in range(first_pair, last_pair + 1):
+        words = generate_frame_keystream(init_keyword, 2 * pair), generate_frame_keystream(init_keyword, 2 * pair + 1)
+        pieces.append(((words[0] << FRAME_BITS) | words[1]).to_bytes(FRAME_PAIR_BYTES, "big"))
+    start = offset - first_pair * FRAME_PAIR_BYTES
+    return b"".join(pieces)[start : start + length]
+
+
+def crypt_frames(data: Buffer, init_keyword: str, offset: int = 0) -> bytes:
+    """Encrypt or decrypt data in frame mode
+
+    :param data: plaintext or ciphertext
+    :param init_keyword: secret word
+    :param offset: position of the data in the whole message
+    :return: data XORed with the frame keystream
+    """
+    return xor_bytes(data, frame_keystream_range(init_keyword, offset, len(data)))
 
 
-def encrypt_file(source: Path, secret: str, destination: Path | None = None) -> None:
+class A51Stream:
+    """Incremental A5/1 cipher
+
+    Keeps the register state between calls, so data can be fed in pieces of any
+    size (file chunks, socket reads) and the result is the same as encrypting it
+    in one go. Encryption and decryption are the same operation.
+
+    With a checkpoint interval the stream also records the register state every
+    `checkpoint_interval` bytes, which later lets `seek` jump close to any offset
+    instead of regenerating the keystream from the beginning.
+    """
+
+    def __init__(self, secret: str, checkpoint_interval: int | None = None) -> None:
+        """Initialize the stream
+
+        :param secret: secret to initialize registers
+        :param checkpoint_interval: number of bytes between recorded register states (optional)
+        """
+        self.initial_registers = populate_registers_packed(secret)
+        self._mac_key = secret.encode("utf-8")
+        self.registers = self.initial_registers
+        self.position = 0
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints: list[tuple[int, int, int]] = []
+
+    def keystream(self, length: int) -> bytes:
+        """Generate the next keystream bytes, recording checkpoints on the way
+
+        :param length: number of keystream bytes
+        :return: keystream
+        """
+        interval = self.checkpoint_interval
+        if not interval:
+            keystream, self.registers = generate_keystream_bytes(length, *self.registers)
+            self.position += length
+            return keystream
+
+        pieces = []
+        while length > 0:
+            if self.position % interval == 0 and self.position // interval == len(self.checkpoints):
+                self.checkpoints.append(self.registers)
+            size = min(length, interval - self.position % interval)
+            keystream, self.registers = generate_keystream_bytes(size, *self.registers)
+            pieces.append(keystream)
+            self.position += size
+            length -= size
+        return b"".join(pieces)
+
+    def update(self, data: Buffer) -> bytes:
+        """Encrypt or decrypt the next piece of data
+
+        :param data: plaintext or ciphertext
+        :return: data XORed with the next len(data) keystream bytes
+        """
+        return xor_bytes(data, self.keystream(len(data)))
+
+    def update_into(self, data: Buffer, out: Buffer | None = None) -> None:
+        """Encrypt or decrypt the next piece of data into a preallocated buffer
+
+        :param data: plaintext or ciphertext
+        :param out: writable buffer of at least len(data) bytes (if None, data is overwritten in place)
+        """
+        xor_into(data, self.keystream(len(data)), out)
+
+    def skip(self, count: int) -> None:
+        """Advance the stream without using the keystream
+
+        :param count: number of bytes to skip
+        """
+        while count > 0:
+            size = min(count, CHUNK_SIZE)
+            self.keystream(size)
+            count -= size
+
+    def seek(self, offset: int) -> None:
+        """Move the stream to an absolute byte offset
+
+        Starts from the closest checkpoint at or before the offset (or from the
+        current position, if that is closer) and skips the remainder.
+
+        :param offset: byte offset in the keystream
+        """
+        if self.checkpoint_interval and self.checkpoints:
+            index = min(offset // self.checkpoint_interval, len(self.checkpoints) - 1)
+            if not index * self.checkpoint_interval <= self.position <= offset:
+                self.registers = self.checkpoints[index]
+                self.position = index * self.checkpoint_interval
+        elif offset < self.position:
+            self.registers = self.initial_registers
+            self.position = 0
+
+        self.skip(offset - self.position)
+
+    def save_checkpoints(self, path: Path) -> None:
+        """Save the recorded checkpoints
+
+        The state at offset 0 is the secret itself, so it is left out; the file
+        ends with an HMAC-SHA256 keyed by the secret. The later states still let
+        anyone holding the file regenerate the keystream from the first interval
+        on (and running A5/1 backwards from them recovers the secret), so the
+        checkpoint file must be kept as private as the secret and never shipped
+        with the ciphertext.
+
+        :param path: checkpoint file
+        """
+        if not self.checkpoint_interval:
+            raise ValueError("The stream does not record checkpoints")
+
+        records = self.checkpoints[1:]
+        data = CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, self.checkpoint_interval, len(records)) + b"".join(
+            CHECKPOINT_RECORD.pack(*registers) for registers in records
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data + hmac.digest(self._mac_key, data, "sha256"))
+
+    def load_checkpoints(self, path: Path) -> None:
+        """Load checkpoints saved by `save_checkpoints`
+
+        :param path: checkpoint file
+        :raise: ValueError if the file is malformed or was created with a different secret
+        """
+        data = path.read_bytes()
+        if len(data) < CHECKPOINT_HEADER.size + CHECKPOINT_MAC_SIZE:
+            raise ValueError(f"{path} is not an A5/1 checkpoint file")
+        magic, interval, count = CHECKPOINT_HEADER.unpack_from(data)
+        if magic != CHECKPOINT_MAGIC or not interval:
+            raise ValueError(f"{path} is not an A5/1 checkpoint file")
+        if len(data) != CHECKPOINT_HEADER.size + count * CHECKPOINT_RECORD.size + CHECKPOINT_MAC_SIZE:
+            raise ValueError(f"{path} is truncated")
+
+        data, mac = data[:-CHECKPOINT_MAC_SIZE], data[-CHECKPOINT_MAC_SIZE:]
+        if not hmac.compare_digest(mac, hmac.digest(self._mac_key, data, "sha256")):
+            raise ValueError(f"{path} does not match the secret")
+
+        self.checkpoint_interval = interval
+        self.checkpoints = [self.initial_registers, *CHECKPOINT_RECORD.iter_unpack(data[CHECKPOINT_HEADER.size :])]
+
+
+def checkpoint_path(file: Path) -> Path:
+    """Location of the checkpoint file that belongs to an encrypted file
+
+    :param file: encrypted file
+    :return: checkpoint file
+    """
+    return file.with_name(file.name + ".ckpt")
+
+
+def stream_file(
+    source: Path,
+    destination: Path,
+    stream: A51Stream,
+    chunk_size: int = CHUNK_SIZE,
+    offset: int = 0,
+    length: int | None = None,
+) -> None:
+    """Run a file (or a byte range of it) through a stream one chunk at a time
+
+    :param source: input file
+    :param destination: output file
+    :param stream: stream used to transform the data, positioned at the offset
+    :param chunk_size: number of bytes to read at a time
+    :param offset: first byte of the source to process
+    :param length: number of bytes to process (if None, until the end of the file)
+    """
+    buffer = memoryview(bytearray(chunk_size))
+
+    with source.open("rb") as file_in, fileio.open_destination(source, destination) as file_out:
+        file_in.seek(offset)
+        remaining = length
+        while remaining is None or remaining > 0:
+            view = buffer if remaining is None else buffer[: min(chunk_size, remaining)]
+            size = file_in.readinto(view)
+            if not size:
+                break
+            stream.update_into(view[:size])
+            file_out.write(view[:size])
+            if remaining is not None:
+                remaining -= size
+
+
+def stream_file_frames(
+    source: Path,
+    destination: Path,
+    secret: str,
+    workers: int | None = None,
+    offset: int = 0,
+    length: int | None = None,
+) -> None:
+    """Run a file (or a byte range of it) through the frame mode on a process pool
+
+    Blocks of FRAME_BLOCK_SIZE bytes are independent of each other, so they are
+    transformed in parallel and written back in order, with a bounded number of
+    blocks in flight.
+
+    :param source: input file
+    :param destination: output file
+    :param secret: secret word
+    :param workers: number of worker processes (default: number of cores; 1 runs in this process)
+    :param offset: first byte of the source to process
+    :param length: number of bytes to process (if None, until the end of the file)
+    """
+    workers = workers or multiprocessing.cpu_count()
+
+    with source.open("rb") as file_in, fileio.open_destination(source, destination) as file_out:
+        file_in.seek(offset)
+        end = None if length is None else offset + length
+
+        def blocks():
+            position = offset
+            while end is None or position < end:
+                block = file_in.read(FRAME_BLOCK_SIZE if end is None else min(FRAME_BLOCK_SIZE, end - position))
+                if not block:
+                    return
+                yield block, position
+                position += len(block)
+
+        if workers == 1:
+            for block, position in blocks():
+                file_out.write(crypt_frames(block, secret, position))
+            return
+
+        with ProcessPoolExecutor(workers) as pool:
+            pending = collections.deque()
+            for block, position in blocks():
+                pending.append(pool.submit(crypt_frames, block, secret, position))
+                if len(pending) >= 2 * workers:
+                    file_out.write(pending.popleft().result())
+            while pending:
+                file_out.write(pending.popleft().result())
+
+
+def encrypt_file(
+    source: Path,
+    secret: str,
+    destination: Path | None = None,
+    checkpoint_interval: int | None = None,
+    frames: bool = False,
+    workers: int | None = None,
+) -> None:
     """Encrypt a file
 
     :param source: file to be encrypted
     :param secret: secret to initialize registers
     :param destination: encrypted file (if None, will use source with .secret suffix)
+    :param checkpoint_interval: if set, save register checkpoints every that many bytes next to the encrypted file
+    :param frames: use the GSM frame mode instead of a single keystream
+    :param workers: number of worker processes in frame mode
     """
-    plaintext = source.read_text(encoding="utf-8")
-    x, y, z = populate_registers(secret)
-    keystream = generate_keystream(len(plaintext), x, y, z)
-    ciphertext = encrypt(plaintext, keystream)
-    
     if destination is None:
         destination = source.with_suffix(".secret")
-    
-    destination.parent.mkdir(parents=True, exist_ok=True)
-    
-    destination.write_bytes(ciphertext)
+
+    if frames:
+        stream_file_frames(source, destination, secret, workers)
+        return
+
+    stream = A51Stream(secret, checkpoint_interval)
+    stream_file(source, destination, stream)
+
+    if checkpoint_interval:
+        stream.save_checkpoints(checkpoint_path(destination))
 
 
-def decrypt_file(source: Path, secret: str, destination: Path | None = None) -> None:
+def open_stream(source: Path, secret: str, offset: int = 0) -> A51Stream:
+    """Create a stream positioned at an offset of an encrypted file
+
+    Uses the checkpoint file next to the source when there is one.
+
+    :param source: encrypted file
+    :param secret: secret to initialize registers
+    :param offset: byte offset in the file
+    :return: stream ready to decrypt from the offset
+    """
+    stream = A51Stream(secret)
+    checkpoints = checkpoint_path(source)
+    if offset and checkpoints.exists():
+        stream.load_checkpoints(checkpoints)
+    stream.seek(offset)
+    return stream
+
+
+def decrypt_range(source: Path, secret: str, offset: int, length: int, frames: bool = False) -> bytes:
+    """Decrypt a byte range of a file
+
+    Ranges are independent of each other, so several of them can be decrypted
+    concurrently.
+
+    :param source: file to be decrypted
+    :param secret: secret to initialize registers
+    :param offset: first byte to decrypt
+    :param length: number of bytes to decrypt
+    :param frames: the file was encrypted in frame mode
+    :return: plaintext of the range
+    """
+    with source.open("rb") as file:
+        file.seek(offset)
+        ciphertext = file.read(length)
+    if frames:
+        return crypt_frames(ciphertext, secret, offset)
+    return open_stream(source, secret, offset).update(ciphertext)
+
+
+def decrypt_file(
+    source: Path,
+    secret: str,
+    destination: Path | None = None,
+    offset: int = 0,
+    length: int | None = None,
+    frames: bool = False,
+    workers: int | None = None,
+) -> None:
     """Decrypt a file
 
     :param source: file to be decrypted
     :param secret: secret to initialize registers
     :param destination: decrypted file (optional)
+    :param offset: first byte to decrypt
+    :param length: number of bytes to decrypt (if None, until the end of the file)
+    :param frames: the file was encrypted in frame mode
+    :param workers: number of worker processes in frame mode
     """
-    ciphertext = source.read_bytes()
-    x, y, z = populate_registers(secret)
-    keystream = generate_keystream(len(ciphertext), x, y, z)
-    plaintext = decrypt(ciphertext, keystream)
-
     if destination is None:
         destination = source.with_suffix(".txt")
 
-    destination.parent.mkdir(parents=True, exist_ok=True)
+    if frames:
+        stream_file_frames(source, destination, secret, workers, offset, length)
+        return
 
-    destination.write_text(plaintext, encoding="utf-8", newline="\n")
+    stream_file(source, destination, open_stream(source, secret, offset), offset=offset, length=length)
 
 
 def main():
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+A5/1 known-plaintext key search
+
+@authors:
+@version: 2025.3
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterator
+
+try:
+    from . import a51_cipher as a51
+except ImportError:
+    import a51_cipher as a51
+
+SHARD_SIZE = 1 << 12
+CANCEL_CHECK = 1 << 8
+
+
+class WordlistSource:
+    """Candidate secrets read from a wordlist, one per line"""
+
+    def __init__(self, path: Path) -> None:
+        """Load the wordlist
+
+        :param path: wordlist file
+        """
+        self.words = [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def candidates(self, start: int, stop: int) -> Iterator[str]:
+        """Candidates with indices in [start, stop)"""
+        return iter(self.words[start:stop])
+
+
+class MaskSource:
+    """Candidate secrets made of a fixed number of characters from a charset"""
+
+    def __init__(self, charset: str, length: int) -> None:
+        """Describe the mask
+
+        :param charset: characters allowed in every position
+        :param length: number of characters in a candidate
+        """
+        self.charset = charset
+        self.length = length
+
+    def __len__(self) -> int:
+        return len(self.charset) ** self.length
+
+    def candidate(self, index: int) -> str:
+        """Candidate with the given index (the last character changes fastest)"""
+        chars = []
+        for _ in range(self.length):
+            index, digit = divmod(index, len(self.charset))
+            chars.append(self.charset[digit])
+        return "".join(reversed(chars))
+
+    def candidates(self, start: int, stop: int) -> Iterator[str]:
+        """Candidates with indices in [start, stop)"""
+        return (self.candidate(index) for index in range(start, stop))
+
+
+def known_keystream(plaintext: bytes, ciphertext: bytes) -> bytes:
+    """Recover the keystream prefix from a known plaintext and its ciphertext
+
+    :param plaintext: known plaintext prefix
+    :param ciphertext: ciphertext
+    :return: keystream bytes covering the common length
+    """
+    length = min(len(plaintext), len(ciphertext))
+    return a51.xor_bytes(plaintext[:length], ciphertext[:length])
+
+
+def matches_keystream(secret: str, keystream: bytes) -> bool:
+    """Check whether a secret produces the keystream
+
+    Generates one byte at a time and stops at the first mismatch.
+
+    :param secret: candidate secret
+    :param keystream: known keystream bytes
+    :return: True if the whole keystream matches
+    """
+    registers = a51.populate_registers_packed(secret)
+    for expected in keystream:
+        byte, registers = a51.generate_keystream_bytes(1, *registers)
+        if byte[0] != expected:
+            return False
+    return True
+
+
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(source: WordlistSource | MaskSource, keystream: bytes, found) -> None:
+    """Set up the shared, read-only state of a worker process"""
+    _WORKER_STATE.update(source=source, keystream=keystream, found=found)
+
+
+def _search_shard(start: int, stop: int) -> tuple[str | None, int]:
+    """Test the candidates of one shard
+
+    :return: the matching secret (or None) and the number of candidates tested
+    """
+    source, keystream, found = _WORKER_STATE["source"], _WORKER_STATE["keystream"], _WORKER_STATE["found"]
+    tested = 0
+    for candidate in source.candidates(start, stop):
+        if tested % CANCEL_CHECK == 0 and found.is_set():
+            break
+        tested += 1
+        if matches_keystream(candidate, keystream):
+            found.set()
+            return candidate, tested
+    return None, tested
+
+
+def search(
+    source: WordlistSource | MaskSource,
+    keystream: bytes,
+    workers: int | None = None,
+    shard_size: int = SHARD_SIZE,
+    progress_file: Path | None = None,
+    report: Callable[[str], None] | None = print,
+) -> str | None:
+    """Search the candidate space for the secret that produced the keystream
+
+    Shards of the candidate space are handed out to a process pool; as soon as
+    one worker finds the secret, the others stop and pending shards are dropped.
+    With a progress file the search records the offset below which every
+    candidate has been tested and resumes from there on the next run.
+
+    :param source: candidate secrets
+    :param keystream: known keystream bytes
+    :param workers: number of worker processes (default: number of cores)
+    :param shard_size: number of candidates per shard
+    :param progress_file: file that holds the resume offset (optional)
+    :param report: callback for progress messages (None to stay quiet)
+    :return: the secret or None if no candidate matches
+    """
+    if not keystream:
+        raise ValueError("The known keystream is empty")
+
+    workers = workers or multiprocessing.cpu_count()
+    total = len(source)
+    offset = int(progress_file.read_text()) if progress_file and progress_file.exists() else 0
+    shards = iter(range(offset, total, shard_size))
+    found = multiprocessing.Event()
+    pending: dict[Future, tuple[int, int]] = {}
+    done_shards: set[int] = set()
+    tested, started, result = 0, time.perf_counter(), None
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(source, keystream, found)) as pool:
+        while True:
+            while len(pending) < 4 * workers and (start := next(shards, None)) is not None:
+                stop = min(start + shard_size, total)
+                pending[pool.submit(_search_shard, start, stop)] = start, stop
+
+            if not pending:
+                break
+
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                start, stop = pending.pop(future)
+                secret, count = future.result()
+                tested += count
+                # a shard cut short because the secret turned up elsewhere is not done
+                if count == stop - start:
+                    done_shards.add(start)
+                if secret is not None and result is None:
+                    result = secret
+
+            if result is not None:
+                found.set()
+                for future in pending:
+                    future.cancel()
+                break
+
+            while offset in done_shards:
+                done_shards.remove(offset)
+                offset = min(offset + shard_size, total)
+            if progress_file is not None and not found.is_set():
+                progress_file.write_text(str(offset))
+
+            if report is not None:
+                elapsed = time.perf_counter() - started
+                report(f"{offset:,}/{total:,} candidates, {tested / elapsed if elapsed else 0:,.0f} keys/s")
+
+    if report is not None:
+        elapsed = time.perf_counter() - started
+        report(f"{tested:,} candidates tested in {elapsed:.2f} s ({tested / elapsed if elapsed else 0:,.0f} keys/s)")
+
+    return result
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Known-plaintext key search for A5/1")
+    parser.add_argument("plaintext", type=Path, help="file with the known plaintext prefix")
+    parser.add_argument("ciphertext", type=Path, help="encrypted file")
+    parser.add_argument("--wordlist", type=Path, help="file with candidate secrets, one per line")
+    parser.add_argument("--charset", help="characters to use for a mask search")
+    parser.add_argument("--length", type=int, default=4, help="number of characters for a mask search")
+    parser.add_argument("--prefix", type=int, default=8, help="number of known bytes to compare")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--resume", type=Path, help="file to save and resume the search offset")
+    args = parser.parse_args()
+
+    if args.wordlist:
+        source = WordlistSource(args.wordlist)
+    elif args.charset:
+        source = MaskSource(args.charset, args.length)
+    else:
+        parser.error("either --wordlist or --charset is required")
+
+    keystream = known_keystream(args.plaintext.read_bytes()[: args.prefix], args.ciphertext.read_bytes())
+    secret = search(source, keystream, args.workers, progress_file=args.resume)
+    print(f"Secret: {secret}" if secret is not None else "Secret not found")
+
+
+if __name__ == "__main__":
+    main()
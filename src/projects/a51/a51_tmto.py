@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+A5/1 internal state recovery with a rainbow (time-memory trade-off) table
+
+@authors:
+@version: 2025.3
+"""
+
+import argparse
+import bisect
+import mmap
+import multiprocessing
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from . import a51_cipher as a51
+except ImportError:
+    import a51_cipher as a51
+
+TABLE_MAGIC = b"A51T"
+TABLE_HEADER = struct.Struct("<4sIIQQ4x")
+TABLE_RECORD = struct.Struct("<QQ")
+STATE_BITS = a51.X_BITS + a51.Y_BITS + a51.Z_BITS
+STATE_MASK = (1 << STATE_BITS) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+GOLDEN_INVERSE = pow(GOLDEN, -1, 1 << STATE_BITS)
+
+
+def state_to_registers(state: int) -> tuple[int, int, int]:
+    """Split a 64-bit state into the packed registers X, Y, Z"""
+    return state & a51.X_MASK, (state >> a51.X_BITS) & a51.Y_MASK, (state >> (a51.X_BITS + a51.Y_BITS)) & a51.Z_MASK
+
+
+def registers_to_state(x: int, y: int, z: int) -> int:
+    """Join the packed registers X, Y, Z into a 64-bit state"""
+    return x | (y << a51.X_BITS) | (z << (a51.X_BITS + a51.Y_BITS))
+
+
+def state_to_secret(state: int) -> bytes:
+    """Recover the 8-byte secret that populates the registers with a state
+
+    The registers are loaded straight from the secret bits, so the initial
+    state and the (zero-padded) secret are the same 64 bits.
+    """
+    bits = "".join(
+        format(register, f"0{width}b")[::-1]
+        for register, width in zip(state_to_registers(state), (a51.X_BITS, a51.Y_BITS, a51.Z_BITS))
+    )
+    return int(bits, 2).to_bytes(8, "big")
+
+
+def point_to_state(point: int) -> int:
+    """Spread a table point over all three registers
+
+    Tables built for a smaller space than 64 bits cover the states that points
+    below 2**space_bits map to; multiplying by an odd constant keeps the mapping
+    one-to-one while touching every register.
+    """
+    return (point * GOLDEN) & STATE_MASK
+
+
+def state_to_point(state: int) -> int:
+    """Inverse of `point_to_state`"""
+    return (state * GOLDEN_INVERSE) & STATE_MASK
+
+
+def keystream_word(state: int) -> int:
+    """First 64 keystream bits produced from a state, as an integer"""
+    keystream, _ = a51.generate_keystream_bytes(8, *state_to_registers(state))
+    return int.from_bytes(keystream, "big")
+
+
+def reduce(value: int, column: int, seed: int, space_bits: int) -> int:
+    """Map a keystream word back to a table point (one function per column)"""
+    return (value ^ ((seed + column * GOLDEN) & STATE_MASK)) & ((1 << space_bits) - 1)
+
+
+def step(point: int, column: int, seed: int, space_bits: int) -> int:
+    """Next point of a chain"""
+    return reduce(keystream_word(point_to_state(point)), column, seed, space_bits)
+
+
+def _chain_start(index: int, seed: int, space_bits: int) -> int:
+    """Deterministic starting point of a chain"""
+    return random.Random(seed * 0x100000000 + index).getrandbits(space_bits)
+
+
+def _build_chains(first: int, last: int, chain_length: int, seed: int, space_bits: int) -> list[tuple[int, int]]:
+    """Compute the (endpoint, start) pairs of chains [first, last)"""
+    pairs = []
+    for index in range(first, last):
+        start = point = _chain_start(index, seed, space_bits)
+        for column in range(chain_length):
+            point = step(point, column, seed, space_bits)
+        pairs.append((point, start))
+    return pairs
+
+
+def build_table(
+    path: Path,
+    chains: int,
+    chain_length: int,
+    seed: int = 0,
+    space_bits: int = STATE_BITS,
+    workers: int | None = None,
+) -> dict[str, float]:
+    """Build a rainbow table and store it sorted by endpoint
+
+    :param path: table file
+    :param chains: number of chains
+    :param chain_length: number of states in a chain
+    :param seed: seed for the starting points and reduction functions
+    :param space_bits: size of the state space covered (2**space_bits points)
+    :param workers: number of worker processes (default: number of cores)
+    :return: build statistics (chains, distinct endpoints, estimated coverage, seconds)
+    """
+    if not 0 < space_bits <= STATE_BITS:
+        raise ValueError(f"space_bits must be in [1, {STATE_BITS}]")
+
+    workers = workers or multiprocessing.cpu_count()
+    started = time.perf_counter()
+    batch = max(1, -(-chains // (4 * workers)))
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_build_chains, first, min(first + batch, chains), chain_length, seed, space_bits)
+            for first in range(0, chains, batch)
+        ]
+        pairs = sorted(pair for future in futures for pair in future.result())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as file:
+        file.write(TABLE_HEADER.pack(TABLE_MAGIC, chain_length, space_bits, seed, len(pairs)))
+        for pair in pairs:
+            file.write(TABLE_RECORD.pack(*pair))
+
+    endpoints = len({endpoint for endpoint, _ in pairs})
+    return {
+        "chains": len(pairs),
+        "endpoints": endpoints,
+        "coverage": min(1.0, endpoints * chain_length / 2**space_bits),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+class RainbowTable:
+    """Memory-mapped rainbow table built by `build_table`"""
+
+    def __init__(self, path: Path) -> None:
+        """Open the table
+
+        :param path: table file
+        :raise: ValueError if the file is not a table
+        """
+        self.file = path.open("rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.chain_length, self.space_bits, self.seed, self.count = TABLE_HEADER.unpack_from(self.map)
+        if magic != TABLE_MAGIC or len(self.map) != TABLE_HEADER.size + self.count * TABLE_RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not an A5/1 rainbow table")
+        self.records = memoryview(self.map)[TABLE_HEADER.size :].cast("Q")
+        self.endpoints = self.records[0::2]
+
+    def close(self) -> None:
+        """Release the mapping"""
+        if hasattr(self, "records"):
+            self.endpoints.release()
+            self.records.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "RainbowTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def starts(self, endpoint: int) -> list[int]:
+        """Starting points of the chains that end in an endpoint"""
+        first = bisect.bisect_left(self.endpoints, endpoint)
+        last = bisect.bisect_right(self.endpoints, endpoint, lo=first)
+        return [self.records[2 * i + 1] for i in range(first, last)]
+
+    def recover(self, keystream: bytes) -> int | None:
+        """Recover a state that produces the first 64 bits of a keystream
+
+        :param keystream: at least 8 known keystream bytes
+        :return: the 64-bit state or None if it is not covered by the table
+        """
+        target = int.from_bytes(keystream[:8], "big")
+        for column in range(self.chain_length - 1, -1, -1):
+            point = reduce(target, column, self.seed, self.space_bits)
+            for later in range(column + 1, self.chain_length):
+                point = step(point, later, self.seed, self.space_bits)
+
+            for start in self.starts(point):
+                candidate = start
+                for earlier in range(column):
+                    candidate = step(candidate, earlier, self.seed, self.space_bits)
+                state = point_to_state(candidate)
+                if keystream_word(state) == target:
+                    return state
+        return None
+
+
+def measure_success(table: RainbowTable, samples: int, seed: int = 1) -> float:
+    """Estimate the success rate of a table on random states
+
+    :param table: rainbow table
+    :param samples: number of random states to try
+    :param seed: seed for the random states
+    :return: fraction of states whose keystream was inverted
+    """
+    rng = random.Random(seed)
+    recovered = 0
+    for _ in range(samples):
+        keystream = keystream_word(point_to_state(rng.getrandbits(table.space_bits))).to_bytes(8, "big")
+        state = table.recover(keystream)
+        recovered += state is not None
+    return recovered / samples if samples else 0.0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Rainbow table state recovery for A5/1")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a table")
+    build.add_argument("table", type=Path)
+    build.add_argument("--chains", type=int, default=1 << 12)
+    build.add_argument("--length", type=int, default=1 << 8, help="chain length")
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--space-bits", type=int, default=STATE_BITS)
+    build.add_argument("--workers", type=int)
+    build.add_argument("--samples", type=int, default=0, help="random states to measure the success rate")
+    lookup = commands.add_parser("lookup", help="recover the state from a known plaintext")
+    lookup.add_argument("table", type=Path)
+    lookup.add_argument("plaintext", type=Path)
+    lookup.add_argument("ciphertext", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        stats = build_table(args.table, args.chains, args.length, args.seed, args.space_bits, args.workers)
+        print(
+            f"{stats['chains']:,} chains ({stats['endpoints']:,} distinct endpoints) in {stats['seconds']:.1f} s, "
+            f"estimated coverage {stats['coverage']:.3e}"
+        )
+        if args.samples:
+            with RainbowTable(args.table) as table:
+                print(f"Success rate: {measure_success(table, args.samples):.2%}")
+    else:
+        keystream = a51.xor_bytes(args.plaintext.read_bytes()[:8], args.ciphertext.read_bytes()[:8])
+        with RainbowTable(args.table) as table:
+            state = table.recover(keystream)
+        if state is None:
+            print("State not covered by the table")
+        else:
+            print(f"State: {state:016x}, secret: {state_to_secret(state)!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Batch Caesar cracking of many ciphertext files
+
+Usage: python src/projects/caesar/caesar_batch.py PATH [PATH ...] [-o DIR] [-r REPORT]
+
+@author:
+@version: 2025.2
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from . import caesar_cipher as cc
+except ImportError:
+    import caesar_cipher as cc
+
+DICTIONARY_FILE = cc.DATA_DIR / "wordlist_english.txt"
+
+
+def collect_files(patterns: list[str]) -> list[Path]:
+    """Sorted, distinct files matched by file names or glob patterns"""
+    return sorted({Path(match) for pattern in patterns for match in glob.glob(pattern) if Path(match).is_file()})
+
+
+def load_shared(dictionary_file: str):
+    """Load the dictionary and its trie into the caches of `caesar_cipher`
+
+    Called in the parent before the pool forks, so the workers share the
+    parent's copy; without fork, each worker loads it once as it starts.
+    """
+    cc.build_trie(cc.load_dictionary(dictionary_file))
+
+
+def crack_file(source: Path, destination: Path | None, dictionary_file: str) -> dict:
+    """Recover the shift of a file and optionally write its plaintext
+
+    :param source: ciphertext file
+    :param destination: plaintext file to write (if None, only the shift is recovered)
+    :param dictionary_file: word list
+    :return: report entry with the file, shift, confidence, and elapsed time in seconds
+    """
+    started = time.perf_counter()
+    shift, score = cc.find_shift(source, dictionary_file)
+    if destination is not None:
+        cc.write_plaintext(source, destination, shift, dictionary_file)
+    return {
+        "file": str(source),
+        "shift": shift,
+        "confidence": round(score, 4),
+        "seconds": round(time.perf_counter() - started, 6),
+    }
+
+
+def crack_files(
+    files: list[Path],
+    dictionary_file: str = DICTIONARY_FILE,
+    output: Path | None = None,
+    workers: int | None = None,
+) -> list[dict]:
+    """Crack many files in a process pool
+
+    :param files: ciphertext files
+    :param dictionary_file: word list, loaded once and shared by the workers
+    :param output: directory for the plaintexts, named after the ciphertexts (if None, none are written)
+    :param workers: number of worker processes (default: number of cores)
+    :return: report entries, in the order of the files
+    """
+    load_shared(dictionary_file)
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+    destinations = [None if output is None else output / source.name for source in files]
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        return [crack_file(source, destination, dictionary_file) for source, destination in zip(files, destinations)]
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=load_shared, initargs=(dictionary_file,)) as pool:
+        futures = [
+            pool.submit(crack_file, source, destination, dictionary_file)
+            for source, destination in zip(files, destinations)
+        ]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Batch Caesar cracking of many ciphertext files")
+    parser.add_argument("paths", nargs="+", help="files or glob patterns")
+    parser.add_argument("-d", "--dictionary", type=Path, default=DICTIONARY_FILE)
+    parser.add_argument("-o", "--output", type=Path, help="directory for the plaintexts (default: report only)")
+    parser.add_argument("-r", "--report", type=Path, help="JSON report file (default: standard output)")
+    parser.add_argument("-j", "--workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        parser.error("no files to process")
+    if args.output is not None and len({source.name for source in files}) != len(files):
+        parser.error("several files would be written to the same destination")
+    if args.output is not None and any((args.output / source.name).resolve() == source.resolve() for source in files):
+        parser.error("a ciphertext would be overwritten by its plaintext")
+
+    started = time.perf_counter()
+    report = {
+        "files": crack_files(files, args.dictionary, args.output, args.workers),
+        "seconds": round(time.perf_counter() - started, 6),
+    }
+    if args.report is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        args.report.write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
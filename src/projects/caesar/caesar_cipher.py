@@ -1,65 +1,425 @@
-#!/usr/bin/env python3
-"""Caesar cipher
-
-@author:
-@version: 2025.2
-"""
-
-import logging
-import string
-from pathlib import Path
-
-DATA_DIR = Path("data/projects/caesar")
-DICT_ENG = set()  # type: set
-
-
-def shift_by_n(word: str, shift: int) -> str:
-    """Shifting all letters in a word by n
-
-    :param word: word to shift
-    :param shift: shift value that specifies encryption (>0) or decryption (<0)
-    """
-    # TODO: Implement this function
-    ...
-
-
-def encrypt(plaintext: str, shift: int, obfuscate=False) -> str:
-    """Encrypt and optionally obfuscate a string
-
-    :param plaintext: plaintext
-    :param shift: shift value
-    :param obfuscate: optional removal of punctuation (;:,.!?'() \n\t)
-    """
-    # TODO: Implement this function
-    ...
-
-
-def decrypt(ciphertext: str, shift: int) -> str:
-    """Decrypt a string
-
-    :param ciphertext: ciphertext
-    :param shift: shift value
-    """
-    # TODO: Implement this function
-    ...
-
-
-def decrypt_file(file_in_name: str, file_out_name: str, shift: int):
-    """Decrypt a file that has not been obfuscated"""
-    # TODO: Consider implementing this function
-    ...
-
-
-def analyze_file(file_in_name: str, file_out_name: str, dictionary_file: str):
-    """Analyze a file that has been obfuscated"""
-    # TODO: Consider implementing this function
-    ...
-
-
-def main():
-    """Main function"""
-    # NOTE: Use this space as you see fit
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""Caesar cipher
+
+@author:
+@version: 2025.2
+"""
+
+import contextlib
+import functools
+import logging
+import math
+import mmap
+import os
+import string
+import sys
+from pathlib import Path
+from typing import Iterator
+
+try:
+    from .. import fileio
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    import fileio
+
+DATA_DIR = Path("data/projects/caesar")
+OBFUSCATED = ";:,.!?'() \n\t"
+CHUNK_SIZE = 1 << 20
+CONFIDENT = 0.5
+CANDIDATES = 3
+SAMPLE_SIZE = 1 << 12
+ANALYSIS_SIZE = 1 << 16
+SEGMENT_WINDOW = 1 << 16
+SEGMENT_CARRY = 64
+UNKNOWN_COST = 15.0
+
+# Frequent English words, most frequent first; the dictionary alone has no
+# frequencies and no two-letter words
+COMMON_WORDS = """
+the of and to a in is it you that he was for on are as with his they i at be this have from or one had by word
+but not what all were we when your can said there use an each which she do how their if will up other about out
+many then them these so some her would make like him into time has look two more write go see number no way could
+people my than first water been call who its now find long down day did get come made may part shall upon us our
+""".split()
+
+# Relative frequencies of the letters A-Z in English text
+ENGLISH_FREQUENCIES = (
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966,
+    0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987,
+    0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+)  # fmt: skip
+
+
+def _shifted(alphabet: str, shift: int) -> str:
+    """Alphabet rotated by shift positions"""
+    return alphabet[shift:] + alphabet[:shift]
+
+
+# One translate table per shift; letters of either case map to the shifted letter
+LOWER, UPPER = string.ascii_lowercase, string.ascii_uppercase
+LETTERS = LOWER + UPPER
+SHIFTED = [_shifted(LOWER, n) + _shifted(UPPER, n) for n in range(26)]
+SHIFTED_UPPER = [_shifted(UPPER, n) * 2 for n in range(26)]
+SHIFTED_LOWER = [_shifted(LOWER, n) * 2 for n in range(26)]
+
+SHIFT_TABLES = [str.maketrans(LETTERS, SHIFTED[n]) for n in range(26)]
+ENCRYPT_TABLES = [str.maketrans(LETTERS, SHIFTED_UPPER[n]) for n in range(26)]
+OBFUSCATE_TABLES = [str.maketrans(LETTERS, SHIFTED_UPPER[n], OBFUSCATED) for n in range(26)]
+DECRYPT_TABLES = [str.maketrans(LETTERS, SHIFTED_LOWER[-n % 26]) for n in range(26)]
+BYTES_SHIFT_TABLES = [bytes.maketrans(LETTERS.encode(), SHIFTED[n].encode()) for n in range(26)]
+BYTES_ENCRYPT_TABLES = [bytes.maketrans(LETTERS.encode(), SHIFTED_UPPER[n].encode()) for n in range(26)]
+BYTES_DECRYPT_TABLES = [bytes.maketrans(LETTERS.encode(), SHIFTED_LOWER[-n % 26].encode()) for n in range(26)]
+
+
+def shift_by_n(word: str, shift: int) -> str:
+    """Shifting all letters in a word by n
+
+    :param word: word to shift
+    :param shift: shift value that specifies encryption (>0) or decryption (<0)
+    :return: the word with every ASCII letter shifted, case preserved
+    """
+    return word.translate(SHIFT_TABLES[shift % 26])
+
+
+def encrypt(plaintext: str, shift: int, obfuscate=False) -> str:
+    """Encrypt and optionally obfuscate a string
+
+    :param plaintext: plaintext
+    :param shift: shift value
+    :param obfuscate: optional removal of punctuation (;:,.!?'() \n\t)
+    :return: uppercase ciphertext
+    """
+    return plaintext.translate((OBFUSCATE_TABLES if obfuscate else ENCRYPT_TABLES)[shift % 26])
+
+
+def decrypt(ciphertext: str, shift: int) -> str:
+    """Decrypt a string
+
+    :param ciphertext: ciphertext
+    :param shift: shift value
+    :return: lowercase plaintext
+    """
+    return ciphertext.translate(DECRYPT_TABLES[shift % 26])
+
+
+def shift_bytes(data: bytes, shift: int) -> bytes:
+    """Shift all ASCII letters in bytes, like `shift_by_n`
+
+    :param data: bytes-like data to shift
+    :param shift: shift value that specifies encryption (>0) or decryption (<0)
+    :return: shifted bytes
+    """
+    return bytes(data).translate(BYTES_SHIFT_TABLES[shift % 26])
+
+
+def encrypt_bytes(data: bytes, shift: int, obfuscate=False) -> bytes:
+    """Encrypt and optionally obfuscate bytes, like `encrypt`
+
+    :param data: bytes-like plaintext
+    :param shift: shift value
+    :param obfuscate: optional removal of punctuation (;:,.!?'() \n\t)
+    :return: uppercase ciphertext
+    """
+    return bytes(data).translate(BYTES_ENCRYPT_TABLES[shift % 26], OBFUSCATED.encode() if obfuscate else b"")
+
+
+def decrypt_bytes(data: bytes, shift: int) -> bytes:
+    """Decrypt bytes, like `decrypt`
+
+    :param data: bytes-like ciphertext
+    :param shift: shift value
+    :return: lowercase plaintext
+    """
+    return bytes(data).translate(BYTES_DECRYPT_TABLES[shift % 26])
+
+
+@contextlib.contextmanager
+def map_file(file_name: str) -> Iterator[bytes]:
+    """Memory-map a file for reading
+
+    :param file_name: file to map
+    :return: the read-only mapping (b"" for an empty file, which cannot be mapped)
+    """
+    with open(file_name, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def windows(data: bytes, size: int, limit: int | None = None) -> Iterator[bytes]:
+    """Split a mapping into windows of at most size bytes
+
+    :param data: mapped file
+    :param size: window size
+    :param limit: stop after this many bytes (default: the whole mapping)
+    :return: the windows, in order; only one is held in memory at a time
+    """
+    end = len(data) if limit is None else min(limit, len(data))
+    for offset in range(0, end, size):
+        yield data[offset : min(offset + size, end)]
+
+
+def decrypt_file(file_in_name: str, file_out_name: str, shift: int):
+    """Decrypt a file that has not been obfuscated
+
+    The file is mapped and translated `CHUNK_SIZE` bytes at a time, so memory
+    use does not grow with the size of the file. The output may be the input
+    file itself (see `fileio.open_destination`).
+    """
+    table = BYTES_DECRYPT_TABLES[shift % 26]
+    with map_file(file_in_name) as data, fileio.open_destination(file_in_name, file_out_name) as file_out:
+        for window in windows(data, CHUNK_SIZE):
+            file_out.write(window.translate(table))
+
+
+def letter_histogram(file_name: str, limit: int | None = None) -> list[int]:
+    """Count the letters of a file in one streaming pass
+
+    :param file_name: file to read
+    :param limit: only count the first limit bytes (default: the whole file)
+    :return: number of occurrences of A-Z, case-insensitive
+    """
+    counts = [0] * 26
+    with map_file(file_name) as data:
+        for chunk in windows(data, CHUNK_SIZE, limit):
+            chunk = chunk.upper()
+            for i, letter in enumerate(UPPER.encode()):
+                counts[i] += chunk.count(letter)
+    return counts
+
+
+def rank_shifts(histogram: list[int]) -> list[tuple[float, int]]:
+    """Rank all shifts by how English the decrypted letter frequencies are
+
+    :param histogram: ciphertext letter counts, as returned by `letter_histogram`
+    :return: (chi-squared statistic, shift) for every shift, most likely first
+    """
+    total = sum(histogram)
+    if not total:
+        return [(0.0, shift) for shift in range(26)]
+    ranking = []
+    for shift in range(26):
+        chi_squared = 0.0
+        for i, frequency in enumerate(ENGLISH_FREQUENCIES):
+            expected = total * frequency
+            chi_squared += (histogram[(i + shift) % 26] - expected) ** 2 / expected
+        ranking.append((chi_squared, shift))
+    return sorted(ranking)
+
+
+def confidence(ranking: list[tuple[float, int]]) -> float:
+    """How far ahead the best shift is: 0 for a tie with the runner-up, close to 1 for a clear winner"""
+    best, second = ranking[0][0], ranking[1][0]
+    return 1 - best / second if second else 0.0
+
+
+def load_dictionary(dictionary_file: str) -> frozenset[str]:
+    """Load a dictionary, once per file
+
+    :param dictionary_file: word list, one word per line
+    :return: set of lowercase words
+    """
+    return read_dictionary(Path(dictionary_file).resolve())
+
+
+@functools.cache
+def read_dictionary(path: Path) -> frozenset[str]:
+    """Read a word list (cached by its absolute path, see `load_dictionary`)"""
+    with open(path, encoding="utf-8") as file:
+        return frozenset(line.strip().lower() for line in file if line.strip())
+
+
+def dictionary_coverage(text: str, dictionary: set[str], longest: int = 12) -> float:
+    """Fraction of the letters of a text covered by dictionary words
+
+    Words are matched greedily, longest first, so this also works on
+    obfuscated text without spaces. Words shorter than 3 letters are ignored.
+
+    :param text: lowercase text
+    :param dictionary: set of lowercase words
+    :param longest: length of the longest word to look for
+    :return: covered letters over all letters
+    """
+    letters = text.translate(str.maketrans("", "", string.punctuation + string.whitespace + string.digits))
+    covered, i = 0, 0
+    while i < len(letters):
+        for length in range(min(longest, len(letters) - i), 2, -1):
+            if letters[i : i + length] in dictionary:
+                covered += length
+                i += length
+                break
+        else:
+            i += 1
+    return covered / len(letters) if letters else 0.0
+
+
+@functools.cache
+def build_trie(dictionary: frozenset[str]) -> dict:
+    """Build the prefix trie used by `segment`, once per dictionary
+
+    Nodes are nested dicts keyed by letter; the empty key of a node holds the
+    cost of the word that ends there: -log of a Zipf probability for the
+    `COMMON_WORDS`, -log(1 / len(dictionary)) for the other words. Single
+    letters other than "a" and "i" are left out.
+
+    :param dictionary: set of lowercase words, as returned by `load_dictionary`
+    :return: the trie, shared by every call with the same dictionary
+    """
+    trie: dict = {}
+    uniform = math.log(len(dictionary) + len(COMMON_WORDS))
+    costs = {word: uniform for word in dictionary if len(word) > 1 or word in ("a", "i")}
+    costs.update((word, math.log(rank + 2)) for rank, word in enumerate(COMMON_WORDS))
+    for word, cost in costs.items():
+        node = trie
+        for letter in word:
+            node = node.setdefault(letter, {})
+        node[""] = cost
+    return trie
+
+
+def segment(text: str, trie: dict) -> list[str]:
+    """Split text without spaces into the cheapest sequence of words
+
+    Dynamic programming over the positions of the text: from every position the
+    trie is walked forward as far as it matches, so the work is linear in the
+    length of the text (times the longest word). Characters that no word covers
+    cost `UNKNOWN_COST` each and are kept together.
+
+    :param text: lowercase text
+    :param trie: prefix trie from `build_trie`
+    :return: words and unknown runs, in order
+    """
+    n = len(text)
+    best = [0.0] + [math.inf] * n
+    back = [(0, False)] * (n + 1)
+    for i in range(n):
+        if best[i] + UNKNOWN_COST < best[i + 1]:
+            best[i + 1], back[i + 1] = best[i] + UNKNOWN_COST, (i, False)
+        node = trie
+        for j in range(i, n):
+            node = node.get(text[j])
+            if node is None:
+                break
+            if "" in node and best[i] + node[""] < best[j + 1]:
+                best[j + 1], back[j + 1] = best[i] + node[""], (i, True)
+
+    words, unknown, j = [], "", n
+    while j > 0:
+        i, known = back[j]
+        if known:
+            if unknown:
+                words.append(unknown)
+                unknown = ""
+            words.append(text[i:j])
+        else:
+            unknown = text[i:j] + unknown
+        j = i
+    if unknown:
+        words.append(unknown)
+    return words[::-1]
+
+
+def segment_file(file_in_name: str, file_out_name: str, shift: int, trie: dict):
+    """Decrypt an obfuscated file and write it as words separated by spaces
+
+    The file is segmented in windows of `SEGMENT_WINDOW` characters; the words
+    that end within `SEGMENT_CARRY` characters of the edge of a window are
+    carried over to the next one so a word is never cut in two. A carry longer
+    than twice that can only be a run that no word covers; it is cut
+    `SEGMENT_CARRY` characters from the edge, so the carry, and the work per
+    window, stay bounded.
+    """
+    carry = ""
+    with (
+        map_file(file_in_name) as data,
+        fileio.open_destination(file_in_name, file_out_name, "w", encoding="utf-8") as file_out,
+    ):
+        chunks = windows(data, SEGMENT_WINDOW)
+        while True:
+            chunk = next(chunks, b"")
+            text = carry + decrypt_bytes(chunk, shift).decode("utf-8", errors="replace")
+            text = "".join(text.split())
+            words = segment(text, trie)
+            if chunk:
+                kept, length = [], 0
+                for word in words:
+                    if length + len(word) > len(text) - SEGMENT_CARRY:
+                        break
+                    kept.append(word)
+                    length += len(word)
+                if len(text) - length > 2 * SEGMENT_CARRY:
+                    kept.append(text[length:-SEGMENT_CARRY])
+                    length = len(text) - SEGMENT_CARRY
+                words, carry = kept, text[length:]
+            if words:
+                file_out.write(" ".join(words) + (" " if chunk else "\n"))
+            if not chunk:
+                break
+
+
+def find_shift(file_in_name: str, dictionary_file: str) -> tuple[int, float]:
+    """Recover the shift of a Caesar-encrypted file
+
+    The letter histogram of the first `ANALYSIS_SIZE` bytes usually settles it;
+    the dictionary is loaded only when the best shift is not clearly ahead, to
+    pick among the top `CANDIDATES`.
+
+    :param file_in_name: ciphertext file
+    :param dictionary_file: word list used to confirm an uncertain guess
+    :return: the shift and the confidence of the frequency ranking
+    """
+    ranking = rank_shifts(letter_histogram(file_in_name, ANALYSIS_SIZE))
+    score = confidence(ranking)
+    if score >= CONFIDENT:
+        return ranking[0][1], score
+
+    with map_file(file_in_name) as data:
+        sample = data[:SAMPLE_SIZE].decode("utf-8", errors="ignore")
+    dictionary = load_dictionary(dictionary_file)
+    best = max(ranking[:CANDIDATES], key=lambda entry: dictionary_coverage(decrypt(sample, entry[1]), dictionary))
+    return best[1], score
+
+
+def write_plaintext(
+    file_in_name: str, file_out_name: str, shift: int, dictionary_file: str, segmented: bool | None = None
+):
+    """Decrypt a file with a known shift, segmenting it if it was obfuscated
+
+    :param file_in_name: ciphertext file
+    :param file_out_name: plaintext file to write
+    :param shift: shift value
+    :param dictionary_file: word list
+    :param segmented: split the plaintext into words with `segment` (default: if the ciphertext has no spaces)
+    """
+    if segmented is None:
+        with map_file(file_in_name) as data:
+            segmented = not any(space in data[:SAMPLE_SIZE] for space in b" \n\t")
+    if segmented:
+        segment_file(file_in_name, file_out_name, shift, build_trie(load_dictionary(dictionary_file)))
+    else:
+        decrypt_file(file_in_name, file_out_name, shift)
+
+
+def analyze_file(file_in_name: str, file_out_name: str, dictionary_file: str, segmented: bool | None = None):
+    """Analyze a file that has been obfuscated
+
+    :param file_in_name: ciphertext file
+    :param file_out_name: plaintext file to write
+    :param dictionary_file: word list
+    :param segmented: split the plaintext into words with `segment` (default: if the ciphertext has no spaces)
+    :return: the shift
+    """
+    shift, _ = find_shift(file_in_name, dictionary_file)
+    write_plaintext(file_in_name, file_out_name, shift, dictionary_file, segmented)
+    return shift
+
+
+def main():
+    """Main function"""
+    # NOTE: Use this space as you see fit
+
+
+if __name__ == "__main__":
+    main()
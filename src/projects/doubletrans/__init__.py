@@ -6,6 +6,6 @@ Double transposition cipher import
 @version: 2022.2
 """
 
-from .doubletrans_cipher import encrypt, decrypt, analyze
+from .doubletrans_cipher import Analyzer, encrypt, decrypt, analyze
 
-__all__ = ["encrypt", "decrypt", "analyze"]
+__all__ = ["Analyzer", "encrypt", "decrypt", "analyze"]
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Simulated annealing analysis of double transposition ciphertext
+
+@authors:
+@version: 2025.2
+"""
+
+import argparse
+import collections
+import functools
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+try:
+    from . import doubletrans_cipher as dt
+except ImportError:
+    import doubletrans_cipher as dt
+
+RESTARTS = 8
+ITERATIONS = 20_000
+START_TEMPERATURE = 2.0
+PADDING_PENALTY = 10.0
+WORD_BONUS = 1.0
+
+
+@functools.cache
+def quadgram_scores() -> tuple[dict[str, float], float]:
+    """Log-probabilities of four-character sequences, from the dictionary
+
+    Words are padded with two spaces on each side so every word, even a
+    one-letter one, has quadgrams that score its boundaries. Punctuation is
+    stripped as in `is_candidate`.
+
+    :return: log10 probability of every quadgram seen and the score of an unseen one
+    """
+    counts = collections.Counter()
+    for word in dt.english_words():
+        padded = f"  {word.translate(dt.PUNCTUATION_TABLE)}  "
+        counts.update(padded[i : i + 4] for i in range(len(padded) - 3))
+    total = sum(counts.values())
+    return {quadgram: math.log10(count / total) for quadgram, count in counts.items()}, math.log10(0.01 / total)
+
+
+def score(text: str) -> float:
+    """Score a decrypted text: higher is more like English
+
+    Every word is padded like the words of `quadgram_scores` and scored on its
+    own, so the score does not depend on which words are next to each other.
+    Empty words (double, leading or trailing spaces) score as an unseen
+    quadgram and dictionary words earn `WORD_BONUS` per character. Padding is
+    skipped, as `decrypt` removes it, but every padding character followed by a
+    real one costs `PADDING_PENALTY`.
+
+    :param text: lowercase decrypted text, padding included
+    :return: sum of the quadgram log-probabilities and bonuses minus the penalties
+    """
+    scores, unseen = quadgram_scores()
+    words = dt.english_words()
+    misplaced = sum(1 for i in range(len(text) - 1) if text[i] == "*" and text[i + 1] != "*")
+    total = -PADDING_PENALTY * misplaced
+    for word in text.translate(dt.PUNCTUATION_TABLE).replace("*", "").split(" "):
+        if not word:
+            total += unseen
+            continue
+        if word in words:
+            total += WORD_BONUS * len(word)
+        padded = f"  {word}  "
+        total += sum(scores.get(padded[i : i + 4], unseen) for i in range(len(padded) - 3))
+    return total
+
+
+def read_grid(grid: list[str], row_order: list[int], column_order: list[int]) -> str:
+    """Read ciphertext rows and columns in plaintext order"""
+    return "".join(grid[r][c] for r in row_order for c in column_order)
+
+
+def mutate(order: list[int], rng: random.Random) -> list[int]:
+    """Swap two items or move one item to another position"""
+    order = order[:]
+    i, j = rng.sample(range(len(order)), 2)
+    if rng.random() < 0.5:
+        order[i], order[j] = order[j], order[i]
+    else:
+        order.insert(j, order.pop(i))
+    return order
+
+
+def climb(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    seed: int,
+    iterations: int = ITERATIONS,
+    deadline: float | None = None,
+) -> tuple[float, str]:
+    """Run one simulated annealing restart over row and column orders
+
+    Starts from random orders; each step changes either the row or the column
+    order and is kept if it scores better, or with a probability that shrinks
+    as the temperature drops to zero.
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param seed: seed for the starting orders and the moves
+    :param iterations: number of steps
+    :param deadline: `time.time()` after which the restart stops (optional)
+    :return: best score and its decrypted text (padding removed)
+    """
+    rows, cols = dimensions
+    text = ciphertext.lower()
+    grid = [text[r * cols : (r + 1) * cols] for r in range(rows)]
+    rng = random.Random(seed)
+    row_order, column_order = rng.sample(range(rows), rows), rng.sample(range(cols), cols)
+    current = score(read_grid(grid, row_order, column_order))
+    best = (current, read_grid(grid, row_order, column_order))
+
+    for step in range(iterations):
+        if deadline is not None and step % 256 == 0 and time.time() > deadline:
+            break
+        if rng.random() < 0.5:
+            new_rows, new_columns = mutate(row_order, rng), column_order
+        else:
+            new_rows, new_columns = row_order, mutate(column_order, rng)
+        decrypted = read_grid(grid, new_rows, new_columns)
+        new_score = score(decrypted)
+        temperature = START_TEMPERATURE * (1 - step / iterations)
+        if new_score >= current or rng.random() < math.exp((new_score - current) / max(temperature, 1e-9)):
+            row_order, column_order, current = new_rows, new_columns, new_score
+            if current > best[0]:
+                best = (current, decrypted)
+
+    return best[0], best[1].replace("*", "")
+
+
+def anneal(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    restarts: int = RESTARTS,
+    iterations: int = ITERATIONS,
+    time_budget: float | None = None,
+    workers: int | None = None,
+    seed: int = 0,
+) -> list[tuple[float, str]]:
+    """Run independent annealing restarts, in parallel unless workers is 1
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param restarts: number of restarts
+    :param iterations: number of steps per restart
+    :param time_budget: seconds after which every restart stops (optional)
+    :param workers: number of worker processes (default: number of cores)
+    :param seed: seed of the first restart; restart i uses seed + i
+    :return: distinct (score, text) pairs, best first
+    """
+    deadline = None if time_budget is None else time.time() + time_budget
+    seeds = range(seed, seed + restarts)
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        results = [climb(ciphertext, dimensions, s, iterations, deadline) for s in seeds]
+    else:
+        quadgram_scores()
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(climb, ciphertext, dimensions, s, iterations, deadline) for s in seeds]
+            results = [future.result() for future in futures]
+    return sorted(set(results), reverse=True)
+
+
+def search_anneal(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    cancelled: Callable[[], bool] | None = None,
+    **kwargs,
+) -> set[str]:
+    """Candidates found by `anneal` that pass `is_candidate`
+
+    A heuristic: it may miss candidates, but it scales to grids that the exact
+    searches cannot finish.
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param cancelled: checked before the search starts
+    :param kwargs: passed to `anneal`
+    :return: set of plaintext candidates
+    """
+    if cancelled is not None and cancelled():
+        return set()
+    return {text for _, text in anneal(ciphertext, dimensions, **kwargs) if dt.is_candidate(text)}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Simulated annealing analysis of double transposition")
+    parser.add_argument("ciphertext")
+    parser.add_argument("--restarts", type=int, default=RESTARTS)
+    parser.add_argument("--iterations", type=int, default=ITERATIONS)
+    parser.add_argument("--time-budget", type=float, help="seconds per grid shape")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--top", type=int, default=3, help="number of results to show per grid shape")
+    args = parser.parse_args()
+
+    for dimensions in dt.factor_pairs(len(args.ciphertext)):
+        start_time = time.perf_counter()
+        results = anneal(args.ciphertext, dimensions, args.restarts, args.iterations, args.time_budget, args.workers)
+        print(f"{dimensions[0]}x{dimensions[1]} ({time.perf_counter() - start_time:.2f} seconds)")
+        for result_score, text in results[: args.top]:
+            print(f"    {result_score:9.1f} {'*' if dt.is_candidate(text) else ' '} {text!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Batch double transposition decryption for many permutations at once
+
+@authors:
+@version: 2025.2
+"""
+
+import itertools
+import math
+import time
+from typing import Callable, Iterator
+
+import numpy as np
+
+try:
+    from . import doubletrans_cipher as dt
+except ImportError:
+    import doubletrans_cipher as dt
+
+BLOCK_SIZE = 1 << 12
+CACHED_ORDERS = 1 << 16
+PADDING = ord("*")
+SPACE = ord(" ")
+
+
+def permutation_blocks(n: int, block_size: int = BLOCK_SIZE) -> Iterator[np.ndarray]:
+    """Generate the permutations of range(n) in blocks
+
+    :param n: number of items
+    :param block_size: number of permutations per block
+    :return: arrays of shape (block, n), in `itertools.permutations` order
+    """
+    permutations = itertools.permutations(range(n))
+    while block := list(itertools.islice(permutations, block_size)):
+        yield np.array(block, dtype=np.intp)
+
+
+def gather_indices(row_order: np.ndarray, column_orders: np.ndarray) -> np.ndarray:
+    """Index arrays that read a grid in a row order and many column orders
+
+    Row i, column j of decrypted text k comes from ciphertext row row_order[i],
+    column column_orders[k, j].
+
+    :param row_order: ciphertext rows in plaintext order
+    :param column_orders: ciphertext columns in plaintext order, one per row of the array
+    :return: array of shape (len(column_orders), rows * columns) of ciphertext positions
+    """
+    cols = column_orders.shape[1]
+    return (row_order[None, :, None] * cols + column_orders[:, None, :]).reshape(len(column_orders), -1)
+
+
+def prefilter(texts: np.ndarray, padding_at_end: bool = True) -> np.ndarray:
+    """Reject decrypted texts that cannot pass `doubletrans_cipher.is_candidate`
+
+    Double spaces are found after skipping padding, as `decrypt` removes it.
+
+    :param texts: decrypted texts, one per row, as character codes
+    :param padding_at_end: also reject texts with padding before the last real character
+    :return: boolean mask of the texts worth checking against the dictionary
+    """
+    positions = np.arange(texts.shape[1])
+    real = texts != PADDING
+    previous = np.maximum.accumulate(np.where(real, positions, -1), axis=1)
+    previous = np.concatenate([np.full((len(texts), 1), -1), previous[:, :-1]], axis=1)
+    previous_char = np.take_along_axis(texts, np.maximum(previous, 0), axis=1)
+    keep = ~((texts == SPACE) & (previous_char == SPACE) & (previous >= 0)).any(axis=1)
+    keep &= real.any(axis=1)
+    if padding_at_end:
+        keep &= (np.diff(real.astype(np.int8), axis=1) <= 0).all(axis=1)
+    return keep
+
+
+def search_batch(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    block_size: int = BLOCK_SIZE,
+    padding_at_end: bool = True,
+    first_rows: list[int] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> set[str]:
+    """Try every row and column permutation of a grid, a block at a time
+
+    For each row order, a block of column orders is decrypted with one gather
+    from the ciphertext array, `prefilter` drops most texts, and only the rest
+    go through `is_candidate`. The blocks of column orders are generated once
+    and reused if there are at most `CACHED_ORDERS` column orders; otherwise
+    they are generated again for every row order, so only one block is held in
+    memory at a time.
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param block_size: number of column orders decrypted at once
+    :param padding_at_end: only keep texts whose padding comes last, as `encrypt` produces
+        (False finds the same candidates as `search_permutations`)
+    :param first_rows: only try row orders that start with one of these rows (default: all)
+    :param cancelled: checked between blocks; the search stops early when it returns True
+    :return: set of plaintext candidates
+    :raise: ValueError if the ciphertext has characters outside Latin-1
+    """
+    rows, cols = dimensions
+    text = np.frombuffer(ciphertext.lower().encode("latin-1"), dtype=np.uint8)
+    cached = list(permutation_blocks(cols, block_size)) if math.factorial(cols) <= CACHED_ORDERS else None
+    candidates = set()
+
+    for row_order in itertools.permutations(range(rows)):
+        if first_rows is not None and row_order[0] not in first_rows:
+            continue
+        for column_orders in permutation_blocks(cols, block_size) if cached is None else cached:
+            if cancelled is not None and cancelled():
+                return candidates
+            texts = text[gather_indices(np.array(row_order, dtype=np.intp), column_orders)]
+            for decrypted in texts[prefilter(texts, padding_at_end)]:
+                plaintext = decrypted.tobytes().decode("latin-1").replace("*", "")
+                if dt.is_candidate(plaintext):
+                    candidates.add(plaintext)
+
+    return candidates
+
+
+def main():
+    """Main function"""
+    ciphertext, dimensions = "NA*DWT  KAATCAT", (3, 5)
+    dt.english_words()
+    for name, search in [("permutations", dt.search_permutations), ("batch", search_batch)]:
+        start_time = time.perf_counter()
+        candidates = search(ciphertext, dimensions)
+        print(f"{name:>12}: {candidates} in {time.perf_counter() - start_time:.4f} seconds")
+
+
+if __name__ == "__main__":
+    main()
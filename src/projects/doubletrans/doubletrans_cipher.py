@@ -6,20 +6,177 @@ Double transposition cipher implementation
 @version: 2025.2
 """
 
-import string
-from pathlib import Path
+import bisect
+import collections
+import functools
+import heapq
 import itertools
+import math
+import mmap
+import multiprocessing
+import operator
+import os
+import string
+import struct
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+try:
+    from .. import fileio
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    import fileio
 
-def load_word_list() -> set[str]:
-    current_file = Path(__file__).resolve()
-    project_root = current_file.parents[3]
-    word_file = project_root / "data" / "projects" / "doubletrans" / "words"
+WORD_FILE = Path(__file__).resolve().parents[3] / "data" / "projects" / "doubletrans" / "words"
+INDEX_MAGIC = b"DTWI"
+INDEX_HEADER = struct.Struct("<4sQQI")
+
+def load_word_list(word_file: Path = WORD_FILE) -> set[str]:
     return {line.strip().lower() for line in word_file.read_text(encoding="utf-8").splitlines() if line.strip()}
 
-ENGLISH_WORDS = load_word_list()
-CACHED_ENGLISH_WORDS = set()
+
+def index_path(word_file: Path) -> Path:
+    """Location of the compiled index of a word list"""
+    return word_file.with_name(word_file.name + ".idx")
+
+
+def compile_word_index(word_file: Path = WORD_FILE, index_file: Path | None = None) -> Path:
+    """Compile a word list into a binary index
+
+    The index holds a header with the source file's size and modification time,
+    the offsets of the words, and the sorted, lowercase words separated by
+    newlines. It is written to a temporary file first so readers never see a
+    partial index.
+
+    :param word_file: word list, one word per line
+    :param index_file: index to write (default: next to the word list)
+    :return: path of the index
+    """
+    index_file = index_file or index_path(word_file)
+    source = word_file.stat()
+    words = sorted(load_word_list(word_file))
+    blob = "\n".join(words).encode("utf-8")
+
+    offsets, offset = [], 0
+    for word in words:
+        offsets.append(offset)
+        offset += len(word.encode("utf-8")) + 1
+    offsets.append(offset)
+
+    temporary = index_file.with_name(index_file.name + f".{os.getpid()}.tmp")
+    with temporary.open("wb") as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, source.st_size, source.st_mtime_ns, len(words)))
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        file.write(blob)
+    os.replace(temporary, index_file)
+    return index_file
+
+
+class WordIndex:
+    """Memory-mapped sorted word list compiled by `compile_word_index`"""
+
+    def __init__(self, index_file: Path, word_file: Path | None = None) -> None:
+        """Open the index
+
+        :param index_file: compiled index
+        :param word_file: source word list; the index must match its size and modification time
+        :raise: ValueError if the file is not an index or is out of date
+        """
+        with index_file.open("rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, mtime_ns, self.count = INDEX_HEADER.unpack_from(self.map)
+        self.data_start = INDEX_HEADER.size + 4 * (self.count + 1)
+        if magic != INDEX_MAGIC or len(self.map) < self.data_start:
+            self.map.close()
+            raise ValueError(f"{index_file} is not a word index")
+        if word_file is not None:
+            source = word_file.stat()
+            if (size, mtime_ns) != (source.st_size, source.st_mtime_ns):
+                self.map.close()
+                raise ValueError(f"{index_file} is out of date")
+        self.offsets = memoryview(self.map)[INDEX_HEADER.size : self.data_start].cast("I")
+
+    def close(self) -> None:
+        """Release the mapping"""
+        self.offsets.release()
+        self.map.close()
+
+    def __enter__(self) -> "WordIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        start = self.data_start + self.offsets[i]
+        return self.map[start : self.data_start + self.offsets[i + 1] - 1].decode("utf-8")
+
+    def __contains__(self, word: str) -> bool:
+        i = bisect.bisect_left(self, word)
+        return i < self.count and self[i] == word
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Check whether some word starts with a prefix"""
+        i = bisect.bisect_left(self, prefix)
+        return i < self.count and self[i].startswith(prefix)
+
+    def words(self) -> frozenset[str]:
+        """All the words, decoded in one pass"""
+        if not self.count:
+            return frozenset()
+        return frozenset(self.map[self.data_start : len(self.map)].decode("utf-8").split("\n"))
+
+
+def open_word_index(word_file: Path = WORD_FILE) -> WordIndex:
+    """Open the index of a word list, compiling it first if it is missing or stale
+
+    :param word_file: word list, one word per line
+    :return: the index
+    """
+    index_file = index_path(word_file)
+    try:
+        return WordIndex(index_file, word_file)
+    except (OSError, ValueError, struct.error):
+        pass
+    return WordIndex(compile_word_index(word_file, index_file), word_file)
+
+
+@functools.cache
+def english_words() -> frozenset[str]:
+    """Dictionary used by the analysis, loaded on first use
+
+    Read from the compiled index so repeated runs skip parsing the word list;
+    if the index cannot be written (read-only data directory), the word list is
+    parsed directly.
+    """
+    try:
+        with open_word_index() as index:
+            return index.words()
+    except OSError:
+        return frozenset(load_word_list())
+
+
+def __getattr__(name: str):
+    if name == "ENGLISH_WORDS":
+        return english_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+PUNCTUATION = frozenset(string.punctuation)
+BEAM_WIDTH = 1024
+COLUMN_ORDERS = 16
+MAX_READERS = 1 << 16
+BLOCK_CHUNK = 1 << 16
 
 def encrypt(plaintext: str, key: tuple[tuple[int, ...], tuple[int, ...]]) -> str:
     """Encrypt plaintext using double transposition cipher with direct string manipulation
@@ -64,80 +221,779 @@ def decrypt(ciphertext: str, key: tuple[tuple[int, ...], tuple[int, ...]]) -> st
     return plaintext
 
 
-def analyze(ciphertext: str) -> set[str]:
-    """Analyze ciphertext generated using double transposition cipher
+def block_permutation(key: tuple[tuple[int, ...], tuple[int, ...]]) -> tuple[int, ...]:
+    """Flat index permutation of a key: position i of a ciphertext block comes from position p[i] of the plaintext block
+
+    :param key: rows and columns permutations
+    :return: source index for every position of a block
+    """
+    row_transposition, col_transposition = key
+    cols = len(col_transposition)
+    return tuple(r * cols + c for r in row_transposition for c in col_transposition)
+
+
+def _transpose_blocks(chunks: Iterable[str], permutation: tuple[int, ...], pad: bool) -> Iterator[str]:
+    """Apply a flat index permutation to consecutive blocks of a stream of text"""
+    size = len(permutation)
+    read = operator.itemgetter(*permutation)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        full = len(buffer) - len(buffer) % size
+        for start in range(0, full, size):
+            yield "".join(read(buffer[start : start + size]))
+        buffer = buffer[full:]
+    if buffer:
+        if not pad:
+            raise ValueError(f"The text length is not a multiple of the block size {size}")
+        yield "".join(read(buffer + "*" * (size - len(buffer))))
+
+
+def encrypt_blocks(chunks: Iterable[str], key: tuple[tuple[int, ...], tuple[int, ...]]) -> Iterator[str]:
+    """Encrypt a stream of text one rows x columns block at a time
+
+    Every block is encrypted as `encrypt` would encrypt it on its own; only the
+    last block is padded. Memory use does not depend on the length of the text.
+
+    :param chunks: plaintext pieces of any length
+    :param key: rows and columns permutations
+    :return: ciphertext blocks
+    """
+    for block in _transpose_blocks(chunks, block_permutation(key), pad=True):
+        yield block.upper()
+
+
+def decrypt_blocks(chunks: Iterable[str], key: tuple[tuple[int, ...], tuple[int, ...]]) -> Iterator[str]:
+    """Decrypt a stream produced by `encrypt_blocks`
+
+    :param chunks: ciphertext pieces of any length
+    :param key: rows and columns permutations
+    :return: plaintext blocks, padding removed as `decrypt` does
+    :raise: ValueError if the ciphertext does not end on a block boundary
+    """
+    inverse = [0] * len(block_permutation(key))
+    for i, source in enumerate(block_permutation(key)):
+        inverse[source] = i
+    for block in _transpose_blocks(chunks, tuple(inverse), pad=False):
+        yield block.replace("*", "").lower()
+
+
+def read_chunks(path: Path, chunk_size: int = BLOCK_CHUNK) -> Iterator[str]:
+    """Read a text file in pieces of chunk_size characters"""
+    with path.open("r", encoding="utf-8", newline="") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+def encrypt_file(source: Path, destination: Path, key: tuple[tuple[int, ...], tuple[int, ...]]) -> None:
+    """Encrypt a text file with `encrypt_blocks`
+
+    :param source: plaintext file
+    :param destination: ciphertext file (may be the source)
+    :param key: rows and columns permutations
+    """
+    with fileio.open_destination(source, destination, "w", encoding="utf-8", newline="") as file:
+        file.writelines(encrypt_blocks(read_chunks(source), key))
+
+
+def decrypt_file(source: Path, destination: Path, key: tuple[tuple[int, ...], tuple[int, ...]]) -> None:
+    """Decrypt a text file written by `encrypt_file`
+
+    :param source: ciphertext file
+    :param destination: plaintext file (may be the source)
+    :param key: rows and columns permutations
+    :raise: ValueError if the ciphertext does not end on a block boundary
+    """
+    with fileio.open_destination(source, destination, "w", encoding="utf-8", newline="") as file:
+        file.writelines(decrypt_blocks(read_chunks(source), key))
+
+
+def factor_pairs(n: int) -> Iterator[tuple[int, int]]:
+    """Generate grid dimensions (rows, columns) for a text of length n
+
+    :param n: text length
+    :return: factor pairs in the order they are tried by `analyze`
+    """
+    i = 2
+    while i * i <= n:
+        if n % i == 0:
+            yield (i, n // i)
+            if i != n // i:
+                yield (n // i, i)
+        i += 1
+
+
+def is_candidate(decrypted: str, words: frozenset[str] | None = None) -> bool:
+    """Check whether a decrypted text consists of English words
+
+    :param decrypted: decrypted text
+    :param words: dictionary (default: `english_words`)
+    :return: True if the text is a plausible plaintext
+    """
+    star_index = decrypted.find('*')
+    if star_index != -1:
+        if any(ch != '*' for ch in decrypted[star_index:]):
+            return False
+        decrypted = decrypted[:star_index]
+
+    if '  ' in decrypted:
+        return False
+
+    decrypted_words = decrypted.translate(PUNCTUATION_TABLE).split()
+    if not decrypted_words:
+        return False
+
+    words = english_words() if words is None else words
+    return all(word.lower() in words for word in decrypted_words)
+
+
+class WordTables(NamedTuple):
+    """Dictionary lookups used to prune the searches"""
+
+    words: frozenset[str]
+    prefixes: frozenset[str]
+    fragments: frozenset[str]
+
+
+def build_word_tables(words: frozenset[str]) -> WordTables:
+    """Build the lookups of a dictionary
+
+    The prefixes are a prefix trie flattened into the set of all word prefixes;
+    the fragments are every substring of a word, since a row that does not start
+    the text may begin in the middle of a word. Punctuation is stripped the same
+    way `is_candidate` strips it from decrypted words.
+
+    :param words: dictionary
+    :return: the words, their prefixes and their fragments
+    """
+    plain = [word for word in words if word == word.translate(PUNCTUATION_TABLE)]
+    return WordTables(
+        words,
+        frozenset(word[:i] for word in plain for i in range(1, len(word) + 1)),
+        frozenset(word[i:j] for word in plain for i in range(len(word)) for j in range(i + 1, len(word) + 1)),
+    )
+
+
+@functools.cache
+def word_tables() -> WordTables:
+    """Lookups of `english_words`, built on first use"""
+    return build_word_tables(english_words())
+
+
+def word_prefixes() -> frozenset[str]:
+    """Every prefix of a word of `english_words`"""
+    return word_tables().prefixes
+
+
+def word_fragments() -> frozenset[str]:
+    """Every substring of a word of `english_words`"""
+    return word_tables().fragments
+
+
+FragmentState = tuple[str, str, bool]
+START_STATE: FragmentState = ("", "", True)
+CONTINUATION_STATE: FragmentState = ("", "", False)
+
+
+def advance_fragment(state: FragmentState, chars: str, tables: WordTables | None = None) -> FragmentState | None:
+    """Extend a partially decrypted piece of text and check it against the dictionary
+
+    The state holds the last character (padding skipped), the current word
+    (punctuation stripped), and whether that word starts a word: the first word
+    of a fragment that does not start the text may be the tail of an earlier
+    one, so it only has to be a piece of a dictionary word. Every other
+    completed word must be in the dictionary and the current word must be a
+    prefix of a dictionary word.
+
+    :param state: state of the fragment so far (START_STATE or CONTINUATION_STATE for a new one)
+    :param chars: lowercase decrypted characters to append
+    :param tables: dictionary lookups (default: `word_tables`)
+    :return: the new state or None if no completion of the fragment can be a candidate
+    """
+    last, word, checkable = state
+    words, prefixes, fragments = word_tables() if tables is None else tables
+    for char in chars:
+        if char == "*":
+            continue
+        if char.isspace():
+            if char == " " and last == " ":
+                return None
+            if word and word not in (words if checkable else fragments):
+                return None
+            word, checkable = "", True
+        elif char not in PUNCTUATION:
+            word += char
+            if word not in (prefixes if checkable else fragments):
+                return None
+        last = char
+    return last, word, checkable
+
+
+def search_permutations(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    first_rows: list[int] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> set[str]:
+    """Try every row and column permutation of a grid
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param first_rows: only try row permutations that start with one of these rows (default: all)
+    :param cancelled: checked between row permutations; the search stops early when it returns True
+    :return: set of plaintext candidates
+    """
+    rows_list = list(range(dimensions[0]))
+    cols_list = list(range(dimensions[1]))
+
+    candidate_list = []
+
+    for row_permutation in itertools.permutations(rows_list):
+        if first_rows is not None and row_permutation[0] not in first_rows:
+            continue
+        if cancelled is not None and cancelled():
+            break
+        for col_permutation in itertools.permutations(cols_list):
+            decrypted = decrypt(ciphertext, (row_permutation, col_permutation))
+            if is_candidate(decrypted):
+                candidate_list.append(decrypted)
+
+    return set(candidate_list)
+
+
+def iter_trie(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    first_rows: list[int] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+    first_columns: list[int] | None = None,
+    tables: WordTables | None = None,
+) -> Iterator[str]:
+    """Backtracking search over a grid, pruned with the dictionary prefixes
+
+    Decryption places ciphertext rows and columns in some order. The search
+    picks the row that comes first, then assigns the plaintext columns one at a
+    time; after every assignment each row's known prefix must pass
+    `advance_fragment` (only the first row may check its leading word). Once all
+    columns are placed, the remaining rows are appended one by one with the same
+    check on the growing text, and complete texts go through `is_candidate`.
+    Columns and rows are tried in order of `bigram_score` with what precedes
+    them, so the more plausible candidates tend to come first.
+
+    The search is exact, but its cost still grows factorially with the grid:
+    texts up to about 30 characters finish in seconds, longer ones can take
+    minutes or more, so pass `cancelled` (or use `search_decomposed`) for them.
+    The first call also spends about 2 seconds building `word_tables`.
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param first_rows: only try these rows as the first row (default: all)
+    :param cancelled: checked at every column assignment; the search stops early when it returns True
+    :param first_columns: only try these columns as the first plaintext column (default: all)
+    :param tables: dictionary lookups (default: `word_tables`)
+    :return: plaintext candidates as they are verified (a text can come more than once)
+    """
+    tables = word_tables() if tables is None else tables
+    rows, cols = dimensions
+    text = ciphertext.lower()
+    grid = [text[r * cols : (r + 1) * cols] for r in range(rows)]
+    column_links = [[-sum(bigram_score(row[a], row[b]) for row in grid) for b in range(cols)] for a in range(cols)]
+
+    def order_rows(joined: str, state: FragmentState, remaining: list[int], row_strings: list[str]) -> Iterator[str]:
+        if not remaining:
+            decrypted = joined.replace("*", "")
+            if is_candidate(decrypted, tables.words):
+                yield decrypted
+            return
+        for r in sorted(remaining, key=lambda r: -bigram_score(joined[-1], row_strings[r][0])):
+            extended = advance_fragment(state, row_strings[r], tables)
+            if extended is not None:
+                others = [other for other in remaining if other != r]
+                yield from order_rows(joined + row_strings[r], extended, others, row_strings)
+
+    def assign_columns(
+        first_row: int,
+        row_strings: list[str],
+        states: list[FragmentState],
+        remaining: list[int],
+        choices: list[int] | None = None,
+        last: int | None = None,
+    ) -> Iterator[str]:
+        if cancelled is not None and cancelled():
+            return
+        if not remaining:
+            others = [r for r in range(rows) if r != first_row]
+            yield from order_rows(row_strings[first_row], states[first_row], others, row_strings)
+            return
+        if choices is None:
+            choices = remaining if last is None else sorted(remaining, key=column_links[last].__getitem__)
+        for c in choices:
+            extended = []
+            for r in range(rows):
+                state = advance_fragment(states[r], grid[r][c], tables)
+                if state is None:
+                    break
+                extended.append(state)
+            else:
+                row_strings_extended = [row + grid[r][c] for r, row in enumerate(row_strings)]
+                others = [other for other in remaining if other != c]
+                yield from assign_columns(first_row, row_strings_extended, extended, others, last=c)
+
+    for first_row in range(rows) if first_rows is None else first_rows:
+        states = [START_STATE if r == first_row else CONTINUATION_STATE for r in range(rows)]
+        yield from assign_columns(first_row, [""] * rows, states, list(range(cols)), first_columns)
+
+
+def search_trie(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    first_rows: list[int] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+    first_columns: list[int] | None = None,
+    tables: WordTables | None = None,
+) -> set[str]:
+    """Run `iter_trie` to the end
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param first_rows: only try these rows as the first row (default: all)
+    :param cancelled: checked at every column assignment; the search stops early when it returns True
+    :param first_columns: only try these columns as the first plaintext column (default: all)
+    :param tables: dictionary lookups (default: `word_tables`)
+    :return: set of plaintext candidates (same as `search_permutations`)
+    """
+    return set(iter_trie(ciphertext, dimensions, first_rows, cancelled, first_columns, tables))
+
+
+@functools.cache
+def bigram_scores() -> dict[tuple[str, str], float]:
+    """Log-probabilities of a character following another, from the dictionary
+
+    Words are padded with spaces so the table also scores word boundaries.
+    Punctuation is stripped as in `is_candidate`; unseen pairs get add-one
+    smoothing through `bigram_score`.
+    """
+    pairs = collections.Counter()
+    for word in english_words():
+        padded = f" {word.translate(PUNCTUATION_TABLE)} "
+        pairs.update(zip(padded, padded[1:]))
+    firsts = collections.Counter()
+    for (first, _), count in pairs.items():
+        firsts[first] += count
+    alphabet = len({char for pair in pairs for char in pair})
+    return {pair: math.log((count + 1) / (firsts[pair[0]] + alphabet)) for pair, count in pairs.items()} | {
+        (first, None): math.log(1 / (count + alphabet)) for first, count in firsts.items()
+    }
+
+
+def bigram_score(first: str, second: str) -> float:
+    """Score two characters that are next to each other in a decrypted row
+
+    Padding can only be followed by padding; characters missing from the
+    dictionary (and pairs with padding) are neutral.
+    """
+    if first == "*":
+        return 0.0 if second == "*" else -math.inf
+    if second == "*" or first in PUNCTUATION or second in PUNCTUATION:
+        return 0.0
+    scores = bigram_scores()
+    return scores.get((first, second), scores.get((first, None), 0.0))
+
+
+def search_decomposed(
+    ciphertext: str,
+    dimensions: tuple[int, int],
+    beam_width: int = BEAM_WIDTH,
+    column_orders: int = COLUMN_ORDERS,
+    cancelled: Callable[[], bool] | None = None,
+) -> set[str]:
+    """Recover the column order first, then the row order
+
+    A column permutation moves characters within every row the same way, so
+    the columns can be ordered on their own: every ordered pair of ciphertext
+    columns is scored by the bigrams it forms across all rows, and a beam search
+    keeps the best partial column orders whose rows still pass `advance_fragment`
+    (as rows that may start mid-word). For the best `column_orders` complete
+    orders, a second beam search orders the rows, scoring the bigram where one
+    row meets the next. Both searches are heuristics and may miss candidates
+    that `search_trie` finds.
+
+    :param ciphertext: encrypted text
+    :param dimensions: rows and columns of the grid
+    :param beam_width: number of partial orders kept at each step
+    :param column_orders: number of complete column orders whose rows are ordered
+    :param cancelled: checked at every beam step; the search stops early when it returns True
+    :return: set of plaintext candidates
+    """
+    rows, cols = dimensions
+    text = ciphertext.lower()
+    grid = [text[r * cols : (r + 1) * cols] for r in range(rows)]
+    pair_scores = [[sum(bigram_score(row[a], row[b]) for row in grid) for b in range(cols)] for a in range(cols)]
+
+    beam = [(0.0, (), [CONTINUATION_STATE] * rows)]
+    for _ in range(cols):
+        if cancelled is not None and cancelled():
+            return set()
+        extended = []
+        for score, order, states in beam:
+            for c in range(cols):
+                link = pair_scores[order[-1]][c] if order else 0.0
+                if c in order or link == -math.inf:
+                    continue
+                new_states = [advance_fragment(state, row[c]) for state, row in zip(states, grid)]
+                if None not in new_states:
+                    extended.append((score + link, order + (c,), new_states))
+        beam = heapq.nlargest(beam_width, extended, key=lambda entry: entry[0])
+
+    candidates = set()
+    for _, order, _ in beam[:column_orders]:
+        row_strings = ["".join(row[c] for c in order) for row in grid]
+        row_beam = [
+            (0.0, (r,), state)
+            for r, row in enumerate(row_strings)
+            if (state := advance_fragment(START_STATE, row)) is not None
+        ]
+        for _ in range(rows - 1):
+            if cancelled is not None and cancelled():
+                return candidates
+            extended = []
+            for score, row_order, state in row_beam:
+                for r, row in enumerate(row_strings):
+                    link = bigram_score(row_strings[row_order[-1]][-1], row[0])
+                    if r in row_order or link == -math.inf:
+                        continue
+                    new_state = advance_fragment(state, row)
+                    if new_state is not None:
+                        extended.append((score + link, row_order + (r,), new_state))
+            row_beam = heapq.nlargest(beam_width, extended, key=lambda entry: entry[0])
+
+        for _, row_order, _ in row_beam:
+            decrypted = "".join(row_strings[r] for r in row_order).replace("*", "")
+            if is_candidate(decrypted):
+                candidates.add(decrypted)
+    return candidates
+
+
+def search_batch(ciphertext: str, dimensions: tuple[int, int], **kwargs) -> set[str]:
+    """Brute force with NumPy, see `doubletrans_batch.search_batch` (imported on first use)
+
+    Padding is allowed anywhere unless padding_at_end is passed, so the
+    candidates are the same as those of `search_permutations`.
+    """
+    try:
+        from . import doubletrans_batch
+    except ImportError:
+        import doubletrans_batch
+
+    kwargs.setdefault("padding_at_end", False)
+    return doubletrans_batch.search_batch(ciphertext, dimensions, **kwargs)
+
+
+def search_anneal(ciphertext: str, dimensions: tuple[int, int], **kwargs) -> set[str]:
+    """Simulated annealing, see `doubletrans_anneal.search_anneal` (imported on first use)"""
+    try:
+        from . import doubletrans_anneal
+    except ImportError:
+        import doubletrans_anneal
+
+    return doubletrans_anneal.search_anneal(ciphertext, dimensions, **kwargs)
+
+
+STRATEGIES = {
+    "brute": search_permutations,
+    "trie": search_trie,
+    "decomposed": search_decomposed,
+    "batch": search_batch,
+    "anneal": search_anneal,
+}
+
+
+_WORKER_STATE: dict = {}
+
+
+def _init_worker(cutoff) -> None:
+    """Set up a worker process with its own copy of the dictionary"""
+    _WORKER_STATE["cutoff"] = cutoff
+    english_words()
+
+
+def shards(strategy: str, dimensions: tuple[int, int]) -> list[dict[str, list[int]]]:
+    """Split the search of a grid shape into independent pieces
+
+    :param strategy: search strategy
+    :param dimensions: rows and columns of the grid
+    :return: extra keyword arguments of the strategy, one set per shard
+    """
+    rows, cols = dimensions
+    if strategy == "trie":
+        return [{"first_rows": [r], "first_columns": [c]} for r in range(rows) for c in range(cols)]
+    if strategy in ("brute", "batch"):
+        return [{"first_rows": [r]} for r in range(rows)]
+    if strategy == "anneal":
+        return [{"workers": 1}]
+    return [{}]
+
+
+def _search_shard(
+    strategy: str, ciphertext: str, index: int, dimensions: tuple[int, int], shard: dict[str, list[int]]
+) -> tuple[int, set[str]]:
+    """Search one shard of a grid shape
+
+    The shard gives up as soon as an earlier grid shape (lower index) has
+    produced candidates.
+
+    :return: the index of the grid shape and the candidates found
+    """
+    cutoff = _WORKER_STATE["cutoff"]
+
+    def cancelled() -> bool:
+        return cutoff.value < index
+
+    if cancelled():
+        return index, set()
+    return index, STRATEGIES[strategy](ciphertext, dimensions, cancelled=cancelled, **shard)
+
+
+def analyze_parallel(
+    ciphertext: str,
+    strategy: str = "decomposed",
+    workers: int | None = None,
+    report: Callable[[str], None] | None = None,
+) -> set[str]:
+    """Analyze ciphertext with a process pool
+
+    Every grid shape is split into `shards` (by first row and, for "trie", first
+    column) and all shards are handed out to the pool. The first grid shape, in
+    `factor_pairs` order, with candidates wins, as in `analyze`: once a shape
+    yields candidates, the shards of later shapes are cancelled and the running
+    ones stop.
 
     :param ciphertext: encrypted text to analyze
+    :param strategy: search to run for each grid shape: "brute", "trie", "decomposed", "batch" or "anneal"
+    :param workers: number of worker processes (default: number of cores)
+    :param report: called with every candidate of the winning shape as soon as it is known
     :return: set of plaintext candidate(s)
+    :raise: ValueError if the strategy is unknown
     """
-    def permutations(elements):
-        if len(elements) <= 1:
-            yield elements
-            return
-        for perm in permutations(elements[1:]):
-            for i in range(len(elements)):
-                yield perm[:i] + elements[0:1] + perm[i:]
-
-    def factor_pairs(n):
-        i = 2
-        while i * i <= n:
-            if n % i == 0:
-                yield (i, n // i)
-                if i != n // i:
-                    yield (n // i, i)
-            i += 1
-
-    def is_candidate(decrypted: str):
-        star_index = decrypted.find('*')
-        if star_index != -1:
-            if any(ch != '*' for ch in decrypted[star_index:]):
-                return False
-            decrypted = decrypted[:star_index]
-
-        if '  ' in decrypted:
-            return False
-        
-        decrypted_words = decrypted.translate(PUNCTUATION_TABLE).split()
-        if not decrypted_words:
-            return False
-        
-        for word in decrypted_words:
-            lower_word = word.lower()
-            if lower_word in CACHED_ENGLISH_WORDS:
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+
+    workers = workers or multiprocessing.cpu_count()
+    shapes = list(factor_pairs(len(ciphertext)))
+    cutoff = multiprocessing.Value("i", len(shapes))
+    remaining = [0] * len(shapes)
+    found: list[set[str]] = [set() for _ in shapes]
+    reported: set[str] = set()
+    pending: dict[Future, int] = {}
+    confirmed = 0
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cutoff,)) as pool:
+        for index, dimensions in enumerate(shapes):
+            for shard in shards(strategy, dimensions):
+                pending[pool.submit(_search_shard, strategy, ciphertext, index, dimensions, shard)] = index
+                remaining[index] += 1
+
+        while confirmed < len(shapes):
+            if not (remaining[confirmed] or found[confirmed]):
+                confirmed += 1
                 continue
-            if lower_word in ENGLISH_WORDS:
-                CACHED_ENGLISH_WORDS.add(lower_word)
-            else:
-                return False
 
-        return True
-    
+            if report is not None:
+                for candidate in sorted(found[confirmed] - reported):
+                    report(candidate)
+                reported |= found[confirmed]
+            if not remaining[confirmed]:
+                break
+
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                index = pending.pop(future)
+                remaining[index] -= 1
+                if future.cancelled():
+                    continue
+                _, candidates = future.result()
+                if candidates and index < cutoff.value:
+                    found[index] |= candidates
+                    cutoff.value = index
+                    for other, other_index in pending.items():
+                        if other_index > index:
+                            other.cancel()
+                elif index <= cutoff.value:
+                    found[index] |= candidates
+
+        for future in pending:
+            future.cancel()
+
+    return found[confirmed] if confirmed < len(shapes) else []
+
+
+def iter_analyze(ciphertext: str, deadline: float | None = None, max_candidates: int | None = None) -> Iterator[str]:
+    """Analyze ciphertext, yielding candidates as soon as they are verified
+
+    Runs `iter_trie` over the grid shapes in `factor_pairs` order and, like
+    `analyze`, stops after the first shape with candidates. Within a shape the
+    more plausible candidates tend to come first.
 
-    def try_all_permutations(text, dimensions):
-        rows_list = list(range(dimensions[0]))
-        cols_list = list(range(dimensions[1]))
+    :param ciphertext: encrypted text to analyze
+    :param deadline: `time.perf_counter()` value at which to stop searching (default: no limit)
+    :param max_candidates: stop after yielding this many candidates (default: no limit)
+    :return: distinct plaintext candidates
+    """
+    def cancelled() -> bool:
+        return deadline is not None and time.perf_counter() >= deadline
+
+    seen: set[str] = set()
+    for dimensions in factor_pairs(len(ciphertext)):
+        for candidate in iter_trie(ciphertext, dimensions, cancelled=cancelled):
+            if candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+                if max_candidates is not None and len(seen) >= max_candidates:
+                    return
+        if seen or cancelled():
+            return
 
-        candidate_list = []
 
-        for row_permutation in itertools.permutations(rows_list):
-            for col_permutation in itertools.permutations(cols_list):
-                decrypted = decrypt(text, (row_permutation, col_permutation))
-                if is_candidate(decrypted):
-                    candidate_list.append(decrypted)
+def analyze(ciphertext: str, strategy: str = "decomposed", workers: int | None = None) -> set[str]:
+    """Analyze ciphertext generated using double transposition cipher
 
-        return set(candidate_list)
+    The default "decomposed" search handles texts of 50 characters and more in
+    seconds, but may miss candidates; "trie" finds the same candidates as
+    "brute" and is practical up to about 30 characters (see `iter_trie`).
 
+    :param ciphertext: encrypted text to analyze
+    :param strategy: search to run for each grid shape: "brute", "trie", "decomposed", "batch" or "anneal"
+    :param workers: number of worker processes for `analyze_parallel` (default: search in this process)
+    :return: set of plaintext candidate(s)
+    :raise: ValueError if the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+    if workers is not None:
+        return analyze_parallel(ciphertext, strategy, workers)
 
-    gen_matrix_dimensions = factor_pairs(len(ciphertext))
-    for dimensions in gen_matrix_dimensions:
+    for dimensions in factor_pairs(len(ciphertext)):
+        permutation_result = STRATEGIES[strategy](ciphertext, dimensions)
 
-        permutation_result = try_all_permutations(ciphertext,dimensions)
-        
         if len(permutation_result) > 0:
             return permutation_result
-    
+
     return []
 
+class Analyzer:
+    """Analysis session that owns its dictionary and per-shape tables
+
+    The dictionary is loaded on first use and the grid shapes of every text
+    length, as well as the decryption tables of small grids for the "brute"
+    strategy, are cached for later texts. All state is guarded by a lock, so one
+    analyzer can be shared between threads.
+    """
+
+    def __init__(self, word_file: Path = WORD_FILE, strategy: str = "trie") -> None:
+        """Set up the session
+
+        :param word_file: word list, one word per line
+        :param strategy: "trie" or "brute"
+        :raise: ValueError if the strategy is unknown
+        """
+        if strategy not in ("trie", "brute"):
+            raise ValueError(f"Unknown strategy {strategy!r}, expected 'trie' or 'brute'")
+        self.word_file = word_file
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._tables: WordTables | None = None
+        self._shapes: dict[int, list[tuple[int, int]]] = {}
+        self._readers: dict[tuple[int, int], list[Callable[[str], tuple[str, ...]]]] = {}
+
+    @property
+    def tables(self) -> WordTables:
+        """Dictionary lookups, built on first use"""
+        with self._lock:
+            if self._tables is None:
+                if self.word_file == WORD_FILE:
+                    self._tables = word_tables()
+                else:
+                    with open_word_index(self.word_file) as index:
+                        self._tables = build_word_tables(index.words())
+            return self._tables
+
+    def shapes(self, length: int) -> list[tuple[int, int]]:
+        """Grid shapes of a text length, in `factor_pairs` order"""
+        with self._lock:
+            if length not in self._shapes:
+                self._shapes[length] = list(factor_pairs(length))
+            return self._shapes[length]
+
+    def readers(self, dimensions: tuple[int, int]) -> Iterable[Callable[[str], tuple[str, ...]]]:
+        """Functions that read a grid in every row and column order
+
+        Cached unless the grid has more than `MAX_READERS` orders.
+
+        :param dimensions: rows and columns of the grid
+        :return: one `operator.itemgetter` per order
+        """
+        rows, cols = dimensions
+        readers = (
+            operator.itemgetter(*(r * cols + c for r in row_order for c in column_order))
+            for row_order in itertools.permutations(range(rows))
+            for column_order in itertools.permutations(range(cols))
+        )
+        if math.factorial(rows) * math.factorial(cols) > MAX_READERS:
+            return readers
+        with self._lock:
+            if dimensions not in self._readers:
+                self._readers[dimensions] = list(readers)
+            return self._readers[dimensions]
+
+    def search(self, ciphertext: str, dimensions: tuple[int, int]) -> set[str]:
+        """Search one grid shape with the session's strategy and dictionary
+
+        :param ciphertext: encrypted text
+        :param dimensions: rows and columns of the grid
+        :return: set of plaintext candidates
+        """
+        tables = self.tables
+        if self.strategy == "trie":
+            return search_trie(ciphertext, dimensions, tables=tables)
+
+        text = ciphertext.lower()
+        candidates = set()
+        for read in self.readers(dimensions):
+            decrypted = "".join(read(text)).replace("*", "")
+            if is_candidate(decrypted, tables.words):
+                candidates.add(decrypted)
+        return candidates
+
+    def analyze(self, ciphertext: str) -> set[str]:
+        """Analyze one ciphertext, as `analyze` does
+
+        :param ciphertext: encrypted text to analyze
+        :return: set of plaintext candidate(s)
+        """
+        for dimensions in self.shapes(len(ciphertext)):
+            candidates = self.search(ciphertext, dimensions)
+            if candidates:
+                return candidates
+        return set()
+
+    def analyze_many(self, ciphertexts: Iterable[str]) -> list[set[str]]:
+        """Analyze many ciphertexts, grouped by length so they share the cached tables
+
+        :param ciphertexts: encrypted texts to analyze
+        :return: sets of plaintext candidates, in the order of the ciphertexts
+        """
+        ciphertexts = list(ciphertexts)
+        by_length: dict[int, list[int]] = collections.defaultdict(list)
+        for i, ciphertext in enumerate(ciphertexts):
+            by_length[len(ciphertext)].append(i)
+
+        results: list[set[str]] = [set() for _ in ciphertexts]
+        for indices in by_length.values():
+            for i in indices:
+                results[i] = self.analyze(ciphertexts[i])
+        return results
+
+
 def main():
     """Main function"""
     print("Phrases to decrypt:")
@@ -150,18 +1006,14 @@ def main():
 
     for phrase in phrases:
         print(phrase)
-        
+        print('Candidates:')
+
         start_time = time.perf_counter()
-        candidates = analyze(phrase)
-        end_time = time.perf_counter()
-        elapsed_time = end_time - start_time
+        for candidate in sorted(analyze(phrase)):
+            print(f"    {candidate!r}")
+        elapsed_time = time.perf_counter() - start_time
 
-        print('Candidates:')
-        print("    " + str(candidates))
         print(f"    Time taken: {elapsed_time:.4f} seconds")
-        print("    Size of cache: " + str(len(CACHED_ENGLISH_WORDS)))
-
-        CACHED_ENGLISH_WORDS.clear()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+File helpers shared by the projects
+
+@authors:
+@version: 2025.3
+"""
+
+import contextlib
+import os
+from pathlib import Path
+from typing import IO, Iterator
+
+
+@contextlib.contextmanager
+def open_destination(source: Path, destination: Path, mode: str = "wb", **kwargs) -> Iterator[IO]:
+    """Open the output file of a transformation for writing
+
+    When the destination is the source itself, the output goes to a temporary
+    file next to it that replaces the source once it is complete, so the
+    source is not truncated (or, if it is memory-mapped, pulled from under the
+    mapping) before it has been read.
+
+    :param source: input file
+    :param destination: output file
+    :param mode: "wb" or "w"
+    :param kwargs: passed to `open` (encoding, newline)
+    :return: the open output file
+    """
+    source, destination = Path(source), Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if not (destination.exists() and source.exists() and destination.samefile(source)):
+        with destination.open(mode, **kwargs) as file_out:
+            yield file_out
+        return
+
+    temporary = destination.with_name(destination.name + ".tmp")
+    try:
+        with temporary.open(mode, **kwargs) as file_out:
+            yield file_out
+        os.replace(temporary, destination)
+    finally:
+        temporary.unlink(missing_ok=True)
@@ -6,6 +6,8 @@ Merkle-Hellman Knapsack cipher implementation
 @version: 2025.3
 """
 
+from dataclasses import dataclass
+
 LARGE_N = 100
 
 
@@ -70,27 +72,15 @@ def calculate_inverse(sik: tuple[int, ...], n: int = 0, m: int = 0) -> int:
     :param m: M value
     :return: inverse modulo i so that m*i = 1 mod n
     """
-    
-    def extended_gcd(a: int, b: int) -> tuple[int, int, int]:
-        if b == 0:
-            return a, 1, 0
-        else:
-            gcd, x1, y1 = extended_gcd(b, a % b)
-            x = y1
-            y = x1 - (a // b) * y1
-            return gcd, x, y
-    
     if n == 0:
         n = calculate_n(sik)
     if m == 0:
         m = calculate_m(n)
 
-    gcd, inverse, _ = extended_gcd(m, n)
-
-    if gcd != 1:
-        raise ValueError(f"{m} has no modular inverses mod {n}")
-    
-    return inverse % n
+    try:
+        return pow(m, -1, n)
+    except ValueError:
+        raise ValueError(f"{m} has no modular inverses mod {n}") from None
 
 
 def generate_gk(sik: tuple[int, ...], n: int = 0, m: int = 0) -> tuple[int, ...]:
@@ -115,15 +105,68 @@ def generate_gk(sik: tuple[int, ...], n: int = 0, m: int = 0) -> tuple[int, ...]
     return tuple(general_knapsack)
 
 
-def encrypt(plaintext: str, gk: tuple[int, ...]) -> int:
+@dataclass(frozen=True)
+class KnapsackPublicKey:
+    """
+    Public key: the general knapsack
+
+    Not a tuple, so a key is never mistaken for a bare knapsack.
+    """
+
+    gk: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class KnapsackPrivateKey:
+    """
+    Private key with every value that decryption needs computed once
+
+    Build it with `from_sik` rather than directly.
+    """
+
+    sik: tuple[int, ...]
+    n: int
+    m: int
+    inverse: int
+    gk: tuple[int, ...]
+
+    @classmethod
+    def from_sik(cls, sik: tuple[int, ...], n: int = 0, m: int = 0) -> "KnapsackPrivateKey":
+        """
+        Precompute a private key
+
+        :param sik: a superincreasing knapsack
+        :param n: N value (default: `calculate_n`)
+        :param m: M value (default: `calculate_m`)
+        :return: the private key
+        :raise: ValueError if m has no inverse modulo n
+        """
+        sik = tuple(sik)
+        if n == 0:
+            n = calculate_n(sik)
+        if m == 0:
+            m = calculate_m(n)
+        return cls(sik, n, m, calculate_inverse(sik, n, m), generate_gk(sik, n, m))
+
+    @property
+    def public_key(self) -> KnapsackPublicKey:
+        """
+        The matching public key
+        """
+        return KnapsackPublicKey(self.gk)
+
+
+def encrypt(plaintext: str, gk: tuple[int, ...] | KnapsackPublicKey | KnapsackPrivateKey) -> int:
     """
     Encrypt a message
 
     :param plaintext: text to encrypt
-    :param gk: general knapsack
+    :param gk: general knapsack, or a key that holds it
     :return: encrypted text
     :raise: ValueError if the message is longer than the knapsack
     """
+    if isinstance(gk, (KnapsackPublicKey, KnapsackPrivateKey)):
+        gk = gk.gk
     knapsack_length = len(gk)
     binary_string = ''.join(format(ord(char), '08b') for char in plaintext)
 
@@ -137,28 +180,35 @@ def encrypt(plaintext: str, gk: tuple[int, ...]) -> int:
     
 
 
-def decrypt(ciphertext: int, sik: tuple[int, ...], n: int = 0, m: int = 0) -> str:
+def decrypt(ciphertext: int, sik: tuple[int, ...] | KnapsackPrivateKey, n: int = 0, m: int = 0) -> str:
     """
     Decrypt a single block.
 
     :param ciphertext: text to decrypt
-    :param sik: superincreasing knapsack
+    :param sik: superincreasing knapsack, or a private key (then n and m are ignored)
     :param n: N value
     :param m: M value
     :return: decrypted string
     """
-    m_inverse = calculate_inverse(sik, n, m)
-    k = (ciphertext * m_inverse) % n
+    if isinstance(sik, KnapsackPrivateKey):
+        sik, n, inverse = sik.sik, sik.n, sik.inverse
+    else:
+        if n == 0:
+            n = calculate_n(sik)
+        if m == 0:
+            m = calculate_m(n)
+        inverse = calculate_inverse(sik, n, m)
+    k = (ciphertext * inverse) % n
 
     plaintext_bits = []
     for weight in reversed(sik):
         if k >= weight:
             k -= weight
-            plaintext_bits.insert(0, "1")
+            plaintext_bits.append("1")
         else:
-            plaintext_bits.insert(0, "0")
+            plaintext_bits.append("0")
 
-    bit_string = ''.join(plaintext_bits)
+    bit_string = ''.join(reversed(plaintext_bits))
     bit_string = bit_string.lstrip("0")
 
     if len(bit_string) % 8 != 0:
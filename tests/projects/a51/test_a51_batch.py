@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Testing batch A5/1 keystream generation
+
+@authors:
+@version: 2025.3
+"""
+
+import importlib
+import pathlib
+import sys
+import tomllib
+from typing import Generator
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.a51 import a51_batch as batch
+    from src.projects.a51 import a51_cipher as a51
+
+
+TIME_LIMIT = 2
+
+
+def get_cases(category: str, *attribs: str) -> Generator:
+    """Get test cases from the TOML file of the cipher tests"""
+    with open(pathlib.Path(__file__).with_name("test_a51_cipher.toml"), "rb") as file:
+        all_cases = tomllib.load(file)
+        for case in all_cases[category]:
+            yield tuple(case.get(a) for a in attribs)
+
+
+SECRETS = [secret for (secret,) in get_cases("test_case_general", "secret")]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_populate_registers_batch():
+    """Testing batch generation of the registers"""
+    x, y, z = batch.populate_registers_batch(SECRETS)
+    assert list(zip(x.tolist(), y.tolist(), z.tolist())) == [a51.populate_registers_packed(s) for s in SECRETS]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_generate_keystream_batch():
+    """Testing that batch keystreams match the single-key keystreams"""
+    keystream, registers = batch.generate_keystream_batch(12, *batch.populate_registers_batch(SECRETS))
+    assert keystream.shape == (len(SECRETS), 12)
+    for i, secret in enumerate(SECRETS):
+        expected, state = a51.generate_keystream_bytes(12, *a51.populate_registers_packed(secret))
+        assert bytes(keystream[i]) == expected
+        assert tuple(int(r[i]) for r in registers) == state
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, secret, ciphertext",
+    get_cases("test_case_general", "plaintext", "secret", "ciphertext"),
+)
+def test_find_matches(plaintext: str, secret: str, ciphertext: list[int]):
+    """Testing the batch known-plaintext check"""
+    keystream = a51.xor_bytes(plaintext.encode("latin-1"), bytes(ciphertext))
+    assert batch.find_matches(SECRETS + ["liberty"], keystream) == [secret]
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
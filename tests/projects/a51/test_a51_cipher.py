@@ -101,6 +101,70 @@ def test_generate_keystream(
     assert a51.generate_keystream(len(plaintext), **register_given) == keystream
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "register_given, register_stepped",
+    get_cases("test_case_basic", "register_given", "register_stepped"),
+)
+def test_pack_register(register_given: dict[str, list[int]], register_stepped: dict[str, list[int]]):
+    """Testing packing and unpacking of the registers"""
+    for name in "xyz":
+        for register in (register_given[name], register_stepped[name]):
+            assert a51.unpack_register(a51.pack_register(register), len(register)) == register
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "register_given, keystream, plaintext",
+    get_cases("test_case_basic", "register_given", "keystream", "plaintext"),
+)
+def test_generate_keystream_bytes(
+    register_given: dict[str, list[int]], keystream: list[int], plaintext: str
+):
+    """Testing keystream generation a byte at a time"""
+    x, y, z = (a51.pack_register(register_given[name]) for name in "xyz")
+    expected = bytes(int("".join(map(str, keystream[i : i + 8])), 2) for i in range(0, len(keystream), 8))
+    assert a51.generate_keystream_bytes(len(plaintext), x, y, z)[0] == expected
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("secret", ["Panda", "infosec", "octoduck", "constitution"])
+def test_generate_keystream_bytes_long(secret: str):
+    """Testing the byte keystream against stepping the register lists over many clocks"""
+    x, y, z = a51.populate_registers(secret)
+    bits = []
+    for _ in range(64 * 8):
+        maj = a51.majority(x[8], y[10], z[10])
+        if x[8] == maj:
+            a51.step_x(x)
+        if y[10] == maj:
+            a51.step_y(y)
+        if z[10] == maj:
+            a51.step_z(z)
+        bits.append(a51.generate_bit(x, y, z))
+    keystream, state = a51.generate_keystream_bytes(64, *a51.populate_registers_packed(secret))
+    assert int.from_bytes(keystream, "big") == int("".join(map(str, bits)), 2)
+    assert state == (
+        a51.pack_register(x[: a51.X_BITS]),
+        a51.pack_register(y[: a51.Y_BITS]),
+        a51.pack_register(z[: a51.Z_BITS]),
+    )
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "secret, generated_register",
+    get_cases("test_case_general", "secret", "generated_register"),
+)
+def test_generate_keystream_continues(secret: str, generated_register: dict[str, list[int]]):
+    """Testing that the registers keep their state between keystream calls"""
+    x, y, z = a51.populate_registers(secret)
+    first = a51.generate_keystream(3, x, y, z)
+    second = a51.generate_keystream(5, x, y, z)
+    x, y, z = (generated_register[name] for name in "xyz")
+    assert first + second == a51.generate_keystream(8, x, y, z)
+
+
 @pytest.mark.timeout(TIME_LIMIT)
 @pytest.mark.parametrize(
     "keystream, ciphertext, plaintext",
@@ -148,6 +212,177 @@ def test_decrypt_text(plaintext: str, secret: str, ciphertext: list[int]):
     assert a51.decrypt(bytearray(ciphertext), keystream) == plaintext
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, secret, ciphertext",
+    get_cases("test_case_general", "plaintext", "secret", "ciphertext"),
+)
+def test_encrypt_bytes(plaintext: str, secret: str, ciphertext: list[int]):
+    """Testing encryption and decryption of buffers"""
+    keystream, _ = a51.generate_keystream_bytes(len(plaintext), *a51.populate_registers_packed(secret))
+    data = bytearray(plaintext, "latin-1")
+    assert a51.encrypt_bytes(memoryview(data), keystream) == bytes(ciphertext)
+    assert a51.decrypt_bytes(bytes(ciphertext), keystream) == data
+
+    out = bytearray(len(data) + 4)
+    a51.xor_into(data, keystream, out)
+    assert out[: len(data)] == bytes(ciphertext)
+    a51.xor_into(data, keystream)
+    assert data == bytes(ciphertext)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_short_keystream():
+    """Testing data longer than the keystream"""
+    keystream = a51.generate_keystream(2, *a51.populate_registers("infosec"))
+    ciphertext = a51.encrypt("ab", keystream)
+    assert a51.encrypt("abcd", keystream) == ciphertext
+    assert a51.decrypt(ciphertext + b"zz", keystream) == "ab"
+    with pytest.raises(ValueError):
+        a51.xor_bytes(ciphertext + b"zz", a51.keystream_to_bytes(keystream))
+    with pytest.raises(ValueError):
+        a51.xor_into(bytearray(ciphertext + b"zz"), a51.keystream_to_bytes(keystream))
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_encrypt_file_utf8():
+    """Testing that non-ASCII files survive encryption and decryption"""
+    plain_file = pathlib.Path(TEST_DIR / "utf8.txt")
+    encrypted_file = pathlib.Path(TEST_DIR / "utf8.secret")
+    decrypted_file = pathlib.Path(TEST_DIR / "utf8.decrypted")
+    plain_file.write_bytes("Ünïcødé — ✓ 暗号\n".encode("utf-8"))
+    a51.encrypt_file(plain_file, "octoduck", encrypted_file)
+    a51.decrypt_file(encrypted_file, "octoduck", decrypted_file)
+    assert decrypted_file.read_bytes() == plain_file.read_bytes()
+    for file in (plain_file, encrypted_file, decrypted_file):
+        file.unlink()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("frames", [False, True])
+def test_encrypt_file_in_place(frames: bool):
+    """Testing that a file can be encrypted and decrypted onto itself"""
+    plaintext = "Congress shall make no law\n".encode("latin-1") * 20
+    secret_file = pathlib.Path(TEST_DIR / "in_place.secret")
+    secret_file.write_bytes(plaintext)
+    a51.encrypt_file(secret_file, "octoduck", frames=frames, workers=1)
+    assert len(secret_file.read_bytes()) == len(plaintext) and secret_file.read_bytes() != plaintext
+
+    text_file = secret_file.rename(secret_file.with_suffix(".txt"))
+    a51.decrypt_file(text_file, "octoduck", frames=frames, workers=1)
+    assert text_file.read_bytes() == plaintext
+    assert not text_file.with_name(text_file.name + ".tmp").exists()
+    text_file.unlink()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, secret, ciphertext",
+    get_cases("test_case_general", "plaintext", "secret", "ciphertext"),
+)
+def test_stream_update(plaintext: str, secret: str, ciphertext: list[int]):
+    """Testing incremental encryption and decryption"""
+    encryptor, decryptor = a51.A51Stream(secret), a51.A51Stream(secret)
+    data = plaintext.encode("latin-1")
+    encrypted = b"".join(encryptor.update(data[i : i + 3]) for i in range(0, len(data), 3))
+    assert encrypted == bytes(ciphertext)
+    assert decryptor.update(encrypted[:1]) + decryptor.update(encrypted[1:]) == data
+    assert encryptor.position == decryptor.position == len(data)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "filename, secret, checksum_plain",
+    get_cases("test_case_file_encryption", "filename", "secret", "checksum_plain"),
+)
+def test_stream_file(filename: str, secret: str, checksum_plain: str):
+    """Testing file decryption in small chunks"""
+    decrypted_file = pathlib.Path(TEST_DIR / f"{filename}.txt")
+    source = pathlib.Path(DATA_DIR / filename).with_suffix(".bin")
+    a51.stream_file(source, decrypted_file, a51.A51Stream(secret), chunk_size=7)
+    assert sha256(open(decrypted_file, "rb").read()).hexdigest() == checksum_plain
+    decrypted_file.unlink()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "filename, secret",
+    get_cases("test_case_file_encryption", "filename", "secret"),
+)
+def test_decrypt_range(filename: str, secret: str):
+    """Testing random access decryption with checkpoints"""
+    encrypted_file = pathlib.Path(TEST_DIR / f"{filename}.secret")
+    decrypted_file = pathlib.Path(TEST_DIR / f"{filename}.txt")
+    a51.encrypt_file(pathlib.Path(DATA_DIR / filename), secret, encrypted_file, checkpoint_interval=16)
+    plaintext = pathlib.Path(DATA_DIR / filename).read_bytes()
+    assert a51.checkpoint_path(encrypted_file).exists()
+    initial = a51.CHECKPOINT_RECORD.pack(*a51.populate_registers_packed(secret))
+    assert initial not in a51.checkpoint_path(encrypted_file).read_bytes()
+
+    for offset, length in [(0, 5), (3, 40), (16, 16), (len(plaintext) - 7, 20), (len(plaintext), 3)]:
+        assert a51.decrypt_range(encrypted_file, secret, offset, length) == plaintext[offset : offset + length]
+
+    a51.decrypt_file(encrypted_file, secret, decrypted_file, offset=5, length=50)
+    assert decrypted_file.read_bytes() == plaintext[5:55]
+
+    with pytest.raises(ValueError):
+        a51.A51Stream(secret[::-1]).load_checkpoints(a51.checkpoint_path(encrypted_file))
+
+    for file in (encrypted_file, a51.checkpoint_path(encrypted_file), decrypted_file):
+        file.unlink()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("interval", [None, 1, 10])
+def test_stream_seek(interval: int | None):
+    """Testing seeking back and forth in the keystream"""
+    keystream, _ = a51.generate_keystream_bytes(100, *a51.populate_registers_packed("infosec"))
+    stream = a51.A51Stream("infosec", interval)
+    stream.skip(60)
+    for offset in [42, 7, 7, 99, 0, 35]:
+        stream.seek(offset)
+        assert stream.keystream(1) == keystream[offset : offset + 1]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_frame_keystream():
+    """Testing that frames have independent keystreams"""
+    keystreams = [a51.generate_frame_keystream("infosec", frame) for frame in range(4)]
+    assert all(0 <= k < 2**a51.FRAME_BITS for k in keystreams)
+    assert len(set(keystreams)) == 4
+    assert a51.generate_frame_keystream("infosec", 3) == keystreams[3]
+    assert a51.generate_frame_keystream("infosed", 3) != keystreams[3]
+    with pytest.raises(ValueError):
+        a51.populate_registers_frame("infosec", a51.FRAME_COUNT)
+
+    pair = (keystreams[2] << a51.FRAME_BITS | keystreams[3]).to_bytes(a51.FRAME_PAIR_BYTES, "big")
+    assert a51.frame_keystream_range("infosec", a51.FRAME_PAIR_BYTES + 5, 30) == pair[5:35]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize(
+    "filename, secret",
+    get_cases("test_case_file_encryption", "filename", "secret"),
+)
+def test_encrypt_file_frames(filename: str, secret: str, workers: int):
+    """Testing file encryption in frame mode"""
+    encrypted_file = pathlib.Path(TEST_DIR / f"{filename}.frames")
+    decrypted_file = pathlib.Path(TEST_DIR / f"{filename}.txt")
+    plaintext = pathlib.Path(DATA_DIR / filename).read_bytes()
+    a51.encrypt_file(pathlib.Path(DATA_DIR / filename), secret, encrypted_file, frames=True, workers=workers)
+    assert encrypted_file.read_bytes() != plaintext
+
+    a51.decrypt_file(encrypted_file, secret, decrypted_file, frames=True, workers=workers)
+    assert decrypted_file.read_bytes() == plaintext
+    a51.decrypt_file(encrypted_file, secret, decrypted_file, offset=60, length=70, frames=True, workers=workers)
+    assert decrypted_file.read_bytes() == plaintext[60:130]
+    assert a51.decrypt_range(encrypted_file, secret, 100, 9, frames=True) == plaintext[100:109]
+
+    encrypted_file.unlink()
+    decrypted_file.unlink()
+
+
 @pytest.mark.timeout(TIME_LIMIT)
 @pytest.mark.parametrize(
     "filename, secret, checksum_cipher",
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Testing the A5/1 bulk command line
+
+@authors:
+@version: 2025.3
+"""
+
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.a51 import __main__ as cli
+
+
+DATA_DIR = pathlib.Path("data/projects/a51/")
+TEST_DIR = pathlib.Path("tests/projects/a51/")
+TIME_LIMIT = 10
+
+
+def test_collect_files():
+    """Testing expansion of directories and glob patterns"""
+    assert len(cli.collect_files([str(DATA_DIR)])) == 16
+    assert cli.collect_files([str(DATA_DIR / "secret1*.bin"), str(DATA_DIR / "simple")]) == [
+        DATA_DIR / "secret1.bin",
+        DATA_DIR / "secret10.bin",
+        DATA_DIR / "simple",
+    ]
+
+
+def test_destination_for():
+    """Testing output file names"""
+    assert cli.destination_for(DATA_DIR / "roster", "encrypt", None) == DATA_DIR / "roster.secret"
+    assert cli.destination_for(DATA_DIR / "roster.bin", "decrypt", TEST_DIR) == TEST_DIR / "roster.txt"
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_main(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """Testing a bulk decryption run"""
+    output = TEST_DIR / "bulk"
+    argv = ["a51", "decrypt", "constitution", str(DATA_DIR / "preamble.bin"), "-o", str(output), "-j", "2"]
+    monkeypatch.setattr(sys, "argv", argv)
+    cli.main()
+
+    decrypted = output / "preamble.txt"
+    assert decrypted.read_bytes() == (DATA_DIR / "preamble").read_bytes()
+    assert "1 files, 328 bytes" in capsys.readouterr().out
+    decrypted.unlink()
+    output.rmdir()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_main_directory(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture):
+    """Testing a bulk decryption run over the whole data directory"""
+    assert [file.name for file in cli.collect_files([str(DATA_DIR)], "encrypt")] == ["preamble", "roster", "simple"]
+    output = TEST_DIR / "bulk"
+    argv = ["a51", "decrypt", "constitution", str(DATA_DIR), "-o", str(output), "-j", "2"]
+    monkeypatch.setattr(sys, "argv", argv)
+    cli.main()
+
+    assert len(list(output.iterdir())) == 13
+    assert (output / "preamble.txt").read_bytes() == (DATA_DIR / "preamble").read_bytes()
+    assert "13 files" in capsys.readouterr().out
+    for file in output.iterdir():
+        file.unlink()
+    output.rmdir()
+
+
+def test_main_in_place(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path):
+    """Testing that a file is never written over itself"""
+    source = tmp_path / "hello.txt"
+    source.write_bytes(b"hello")
+    monkeypatch.setattr(sys, "argv", ["a51", "decrypt", "k", str(source)])
+    with pytest.raises(SystemExit):
+        cli.main()
+    assert source.read_bytes() == b"hello"
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Testing the A5/1 key search
+
+@authors:
+@version: 2025.3
+"""
+
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.a51 import a51_cipher as a51
+    from src.projects.a51 import a51_search as search
+
+
+DATA_DIR = pathlib.Path("data/projects/a51/")
+TEST_DIR = pathlib.Path("tests/projects/a51/")
+TIME_LIMIT = 20
+
+
+@pytest.fixture
+def preamble_keystream() -> bytes:
+    """Keystream recovered from the preamble and its ciphertext"""
+    plaintext = (DATA_DIR / "preamble").read_bytes()
+    return search.known_keystream(plaintext[:8], (DATA_DIR / "preamble.bin").read_bytes())
+
+
+def test_mask_source():
+    """Testing enumeration of a mask"""
+    source = search.MaskSource("abc", 2)
+    assert len(source) == 9
+    assert list(source.candidates(0, 9)) == ["aa", "ab", "ac", "ba", "bb", "bc", "ca", "cb", "cc"]
+    assert list(source.candidates(4, 6)) == ["bb", "bc"]
+
+
+def test_matches_keystream(preamble_keystream: bytes):
+    """Testing the early-exit keystream comparison"""
+    assert search.matches_keystream("constitution", preamble_keystream)
+    assert not search.matches_keystream("constipation", preamble_keystream)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_wordlist(preamble_keystream: bytes, workers: int):
+    """Testing a wordlist search over a process pool"""
+    wordlist = TEST_DIR / "wordlist.txt"
+    wordlist.write_text("\n".join(["liberty", "union", "justice", "constitution", "welfare"] * 5))
+    source = search.WordlistSource(wordlist)
+    assert search.search(source, preamble_keystream, workers, shard_size=3, report=None) == "constitution"
+    wordlist.unlink()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_search_mask_resume():
+    """Testing a mask search that resumes from a saved offset"""
+    secret, plaintext = "cab", b"known plaintext"
+    ciphertext = a51.A51Stream(secret).update(plaintext)
+    keystream = search.known_keystream(plaintext, ciphertext)
+    source = search.MaskSource("abc", 3)
+    progress = TEST_DIR / "search.progress"
+
+    progress.write_text(str(len(source)))
+    assert search.search(source, keystream, 1, progress_file=progress, report=None) is None
+    progress.write_text("4")
+    assert search.search(source, keystream, 2, shard_size=4, progress_file=progress, report=None) == secret
+    assert int(progress.read_text()) <= list(source.candidates(0, len(source))).index(secret)
+    progress.unlink()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Testing the A5/1 rainbow table
+
+@authors:
+@version: 2025.3
+"""
+
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.a51 import a51_cipher as a51
+    from src.projects.a51 import a51_tmto as tmto
+
+
+DATA_DIR = pathlib.Path("data/projects/a51/")
+TEST_DIR = pathlib.Path("tests/projects/a51/")
+TIME_LIMIT = 20
+
+
+@pytest.mark.parametrize("secret", ["Panda", "infosec", "octoduck", "constitution"])
+def test_state_to_secret(secret: str):
+    """Testing that the state is the padded secret"""
+    state = tmto.registers_to_state(*a51.populate_registers_packed(secret))
+    assert tmto.state_to_registers(state) == a51.populate_registers_packed(secret)
+    assert tmto.state_to_secret(state) == secret.encode()[:8].ljust(8, b"\0")
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_rainbow_table():
+    """Testing building a table and recovering states from it"""
+    path = TEST_DIR / "rainbow.table"
+    stats = tmto.build_table(path, chains=64, chain_length=16, seed=7, space_bits=12, workers=2)
+    assert stats["chains"] == 64
+
+    with tmto.RainbowTable(path) as table:
+        assert (table.chain_length, table.space_bits, table.seed, table.count) == (16, 12, 7, 64)
+        point = table.records[1]
+        for column in range(5):
+            point = tmto.step(point, column, table.seed, table.space_bits)
+        state = tmto.point_to_state(point)
+        keystream = tmto.keystream_word(state).to_bytes(8, "big")
+        recovered = table.recover(keystream)
+        assert recovered is not None
+        assert tmto.keystream_word(recovered) == tmto.keystream_word(state)
+        assert 0 < tmto.measure_success(table, 20) <= 1
+
+    path.unlink()
+
+
+def test_recover_preamble():
+    """Testing that the preamble keystream is recovered once its chain is in the table"""
+    path = TEST_DIR / "preamble.table"
+    keystream = a51.xor_bytes((DATA_DIR / "preamble").read_bytes()[:8], (DATA_DIR / "preamble.bin").read_bytes())
+    state = tmto.registers_to_state(*a51.populate_registers_packed("constitution"))
+    start = tmto.state_to_point(state)
+    end = tmto.step(start, 0, 0, tmto.STATE_BITS)
+    path.write_bytes(tmto.TABLE_HEADER.pack(tmto.TABLE_MAGIC, 1, tmto.STATE_BITS, 0, 1) + tmto.TABLE_RECORD.pack(end, start))
+
+    with tmto.RainbowTable(path) as table:
+        assert tmto.state_to_secret(table.recover(keystream)) == b"constitu"
+
+    path.unlink()
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Testing batch Caesar cracking
+
+@authors:
+@version: 2025.2
+"""
+
+import importlib
+import json
+import pathlib
+import sys
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.caesar import caesar_batch as batch
+
+
+DATA_DIR = pathlib.Path("data/projects/caesar/")
+TIME_LIMIT = 10
+SHIFTS = {"ciphertext_0.txt": 3, "ciphertext_1.txt": 20, "ciphertext_2.txt": 18}
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_collect_files():
+    """Testing glob expansion"""
+    files = batch.collect_files([str(DATA_DIR / "ciphertext_*.txt")])
+    assert [file.name for file in files] == sorted(SHIFTS)
+    assert batch.collect_files([str(DATA_DIR / "ciphertext_0.txt"), str(DATA_DIR / "ciphertext_[01].txt")]) == files[:2]
+    assert batch.collect_files([str(DATA_DIR)]) == []
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_crack_files(workers, tmp_path):
+    """Testing that the pool recovers every shift and writes the plaintexts"""
+    files = batch.collect_files([str(DATA_DIR / "ciphertext_*.txt")])
+    report = batch.crack_files(files, output=tmp_path, workers=workers)
+    assert [entry["file"] for entry in report] == [str(file) for file in files]
+    assert {pathlib.Path(entry["file"]).name: entry["shift"] for entry in report} == SHIFTS
+    assert all(0 <= entry["confidence"] <= 1 and entry["seconds"] >= 0 for entry in report)
+    assert json.loads(json.dumps(report)) == report
+    assert (tmp_path / "ciphertext_0.txt").read_text().startswith("hello world!")
+    assert (tmp_path / "ciphertext_2.txt").read_text().startswith("congress shall make no law")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
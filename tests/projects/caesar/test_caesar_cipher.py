@@ -84,5 +84,124 @@ def test_decrypt(plaintext, shift, ciphertext):
     assert cc.decrypt(ciphertext, shift) == plaintext
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, shift, ciphertext, obfuscated, shifted",
+    get_cases("test_case", "plaintext", "shift", "ciphertext", "obfuscated", "shifted"),
+)
+def test_bytes(plaintext, shift, ciphertext, obfuscated, shifted):
+    """Testing the bytes API"""
+    assert cc.shift_bytes(plaintext.encode(), shift) == shifted.encode()
+    assert cc.encrypt_bytes(plaintext.encode(), shift) == ciphertext.encode()
+    assert cc.encrypt_bytes(plaintext.encode(), shift, True) == obfuscated.encode()
+    assert cc.decrypt_bytes(memoryview(ciphertext.encode()), shift) == plaintext.encode()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "file_name, shift, beginning",
+    [
+        ("ciphertext_0.txt", 3, "hello world!"),
+        ("ciphertext_1.txt", 20, "preamble"),
+        ("ciphertext_2.txt", 18, "congress shall make no law"),
+    ],
+)
+def test_analyze_file(file_name, shift, beginning, tmp_path):
+    """Testing analyze_file() method"""
+    file_out = tmp_path / "plaintext.txt"
+    assert cc.analyze_file(DATA_DIR / file_name, file_out, DATA_DIR / "wordlist_english.txt") == shift
+    assert file_out.read_text().startswith(beginning)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_decrypt_file_windows(tmp_path, monkeypatch):
+    """Testing decrypt_file() across window boundaries and on an empty file"""
+    plaintext = "The quick brown fox jumps over the lazy dog.\n" * 50
+    file_in, file_out = tmp_path / "ciphertext.txt", tmp_path / "plaintext.txt"
+    file_in.write_text(cc.encrypt(plaintext, 7))
+    monkeypatch.setattr(cc, "CHUNK_SIZE", 100)
+    cc.decrypt_file(file_in, file_out, 7)
+    assert file_out.read_text() == plaintext.lower()
+    assert cc.letter_histogram(file_in, 44)[0] == 2  # "t" encrypts to "A"
+    file_in.write_bytes(b"")
+    cc.decrypt_file(file_in, file_out, 7)
+    assert file_out.read_bytes() == b""
+    assert cc.letter_histogram(file_in) == [0] * 26
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("file_name, beginning", [("ciphertext_1.txt", "preamble"), ("ciphertext_2.txt", "congress shall")])
+def test_analyze_file_in_place(file_name, beginning, tmp_path):
+    """Testing that a file can be decrypted onto itself"""
+    file = tmp_path / file_name
+    file.write_bytes((DATA_DIR / file_name).read_bytes())
+    cc.analyze_file(file, file, DATA_DIR / "wordlist_english.txt")
+    assert file.read_text().startswith(beginning)
+    file.write_bytes((DATA_DIR / file_name).read_bytes())
+    cc.decrypt_file(file, file, 0)
+    assert file.read_bytes() == (DATA_DIR / file_name).read_bytes().lower()
+    assert [path.name for path in tmp_path.iterdir()] == [file_name]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_find_shift_without_dictionary():
+    """Testing that a clear frequency ranking does not load the dictionary"""
+    shift, confidence = cc.find_shift(DATA_DIR / "ciphertext_1.txt", DATA_DIR / "missing.txt")
+    assert shift == 20 and confidence >= cc.CONFIDENT
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_load_dictionary(tmp_path):
+    """Testing that dictionaries and tries are cached per file"""
+    small = tmp_path / "small.txt"
+    small.write_text("cab\nab\n")
+    assert cc.load_dictionary(small) == {"cab", "ab"}
+    assert cc.load_dictionary(str(small)) is cc.load_dictionary(small)
+    english = cc.load_dictionary(DATA_DIR / "wordlist_english.txt")
+    assert "congress" in english and "congress" not in cc.load_dictionary(small)
+    assert cc.build_trie(english) is cc.build_trie(english)
+    trie = cc.build_trie(cc.load_dictionary(small))
+    assert trie is not cc.build_trie(english)
+    assert cc.segment("cabzz", trie) == ["cab", "zz"]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_segment():
+    """Testing the word segmentation"""
+    trie = {}
+    for word, cost in [("the", 1.0), ("then", 3.0), ("hen", 3.0), ("law", 2.0), ("a", 2.0)]:
+        node = trie
+        for letter in word:
+            node = node.setdefault(letter, {})
+        node[""] = cost
+    assert cc.segment("thenlaw", trie) == ["then", "law"]
+    assert cc.segment("thexqlaw", trie) == ["the", "xq", "law"]
+    assert cc.segment("", trie) == []
+
+
+@pytest.mark.timeout(TIME_LIMIT * 2)
+def test_analyze_file_segmented(tmp_path, monkeypatch):
+    """Testing that segmenting in small windows gives the same plaintext"""
+    dictionary = DATA_DIR / "wordlist_english.txt"
+    cc.analyze_file(DATA_DIR / "ciphertext_2.txt", tmp_path / "whole.txt", dictionary)
+    assert (tmp_path / "whole.txt").read_text().startswith("congress shall make no law respecting an establishment")
+    monkeypatch.setattr(cc, "SEGMENT_WINDOW", 100)
+    cc.analyze_file(DATA_DIR / "ciphertext_2.txt", tmp_path / "windows.txt", dictionary, segmented=True)
+    assert (tmp_path / "windows.txt").read_text() == (tmp_path / "whole.txt").read_text()
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_segment_file_unknown(tmp_path, monkeypatch):
+    """Testing that text without words keeps the carry bounded"""
+    file_in, file_out = tmp_path / "digits.txt", tmp_path / "plaintext.txt"
+    file_in.write_text("0123456789" * 100 + "HELLO")
+    monkeypatch.setattr(cc, "SEGMENT_WINDOW", 100)
+    calls = []
+    monkeypatch.setattr(cc, "segment", lambda text, trie: calls.append(len(text)) or [text])
+    cc.segment_file(file_in, file_out, 0, {})
+    assert max(calls) <= cc.SEGMENT_WINDOW + 2 * cc.SEGMENT_CARRY
+    assert "".join(file_out.read_text().split()) == "0123456789" * 100 + "hello"
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Simulated annealing double transposition analysis testing
+
+@authors:
+@version: 2025.2
+"""
+
+import importlib
+import pathlib
+import sys
+
+import pytest
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.doubletrans import analyze
+    from src.projects.doubletrans import doubletrans_anneal as anneal
+
+
+TIME_LIMIT = 10
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, scrambled",
+    [
+        ("attack at dawn", "atatck ta dawn"),
+        ("houston, we have a problem", "ouhston, we haev a prolbem"),
+        ("computer science***", "compu*ter science**"),
+    ],
+)
+def test_score(plaintext: str, scrambled: str):
+    """Testing that English scores better than scrambled text"""
+    assert anneal.score(plaintext) > anneal.score(scrambled)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_climb():
+    """Testing that a restart is reproducible"""
+    first = anneal.climb("NA*DWT  KAATCAT", (3, 5), seed=7, iterations=2000)
+    assert first == anneal.climb("NA*DWT  KAATCAT", (3, 5), seed=7, iterations=2000)
+    assert "*" not in first[1]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_anneal(workers: int):
+    """Testing the annealing search"""
+    found = anneal.search_anneal("NA*DWT  KAATCAT", (3, 5), restarts=2, iterations=5000, workers=workers)
+    assert found == {"attack at dawn"}
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_anneal_time_budget():
+    """Testing that the time budget stops the restarts"""
+    ciphertext = "MISENHTOWEGIDKC HW IA STCSYO*EM "
+    results = anneal.anneal(ciphertext, (4, 8), restarts=2, iterations=10**9, time_budget=0.5, workers=1)
+    assert 1 <= len(results) <= 2
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_analyze_anneal():
+    """Testing the annealing strategy of the analysis"""
+    assert analyze("NA*DWT  KAATCAT", strategy="anneal", workers=1) == {"attack at dawn"}
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
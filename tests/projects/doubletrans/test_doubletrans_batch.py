@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Batch double transposition decryption testing
+
+@authors:
+@version: 2025.2
+"""
+
+import importlib
+import pathlib
+import sys
+from typing import Generator
+
+import numpy as np
+import pytest
+import tomllib
+
+try:
+    importlib.util.find_spec(".".join(pathlib.Path(__file__).parts[-3:-1]), "src")
+except ModuleNotFoundError:
+    sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
+finally:
+    from src.projects.doubletrans import analyze, decrypt
+    from src.projects.doubletrans import doubletrans_batch as batch
+    from src.projects.doubletrans import doubletrans_cipher as dt
+
+
+TIME_LIMIT = 5
+
+
+def get_cases(category: str, *attribs: str) -> Generator:
+    """Get test cases from the TOML file of the cipher"""
+    with open(pathlib.Path(__file__).with_name("test_doubletrans_cipher.toml"), "rb") as file:
+        all_cases = tomllib.load(file)
+        for case in all_cases[category]:
+            yield tuple(case.get(a) for a in attribs)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext, key",
+    get_cases("test_case", "ciphertext", "key"),
+)
+def test_gather_indices(ciphertext: str, key: tuple[tuple[int, ...], tuple[int, ...]]):
+    """Testing that a gather decrypts like `decrypt`"""
+    row_order = np.argsort(key[0])
+    column_orders = np.array([np.argsort(key[1])])
+    text = np.frombuffer(ciphertext.lower().encode("latin-1"), dtype=np.uint8)
+    decrypted = text[batch.gather_indices(row_order, column_orders)][0]
+    assert decrypted.tobytes().decode("latin-1").replace("*", "") == decrypt(ciphertext, key)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_prefilter():
+    """Testing the vectorized pre-filters"""
+    texts = np.array([list(text.encode()) for text in ["ab c**", "ab  c*", "ab *c*", "ab * c", "a*b c*", "******"]])
+    assert batch.prefilter(texts).tolist() == [True, False, False, False, False, False]
+    assert batch.prefilter(texts, padding_at_end=False).tolist() == [True, False, True, False, True, False]
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext, key",
+    get_cases("test_case", "ciphertext", "key"),
+)
+def test_search_batch(ciphertext: str, key: tuple[tuple[int, ...], tuple[int, ...]]):
+    """Testing the batch search against brute force"""
+    dimensions = (len(key[0]), len(key[1]))
+    if dimensions[0] * dimensions[1] > 20:
+        pytest.skip("brute force is too slow for this grid")
+    expected = dt.search_permutations(ciphertext, dimensions)
+    assert batch.search_batch(ciphertext, dimensions, block_size=100, padding_at_end=False) == expected
+    assert batch.search_batch(ciphertext, dimensions) <= expected
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_search_batch_uncached(monkeypatch: pytest.MonkeyPatch):
+    """Testing that regenerating the column orders for every row order finds the same candidates"""
+    ciphertext, dimensions = "NA*DWT  KAATCAT", (3, 5)
+    expected = batch.search_batch(ciphertext, dimensions, block_size=7)
+    monkeypatch.setattr(batch, "CACHED_ORDERS", 1)
+    assert batch.search_batch(ciphertext, dimensions, block_size=7) == expected == {"attack at dawn"}
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext, candidates",
+    get_cases("test_case", "ciphertext", "candidates"),
+)
+def test_analyze_batch(ciphertext: str, candidates: list[str]):
+    """Testing that the batch strategy of the analysis finds every candidate"""
+    if not candidates:
+        pytest.skip("no candidates to compare with")
+    if len(ciphertext) > 16:
+        pytest.skip("the batch search is too slow for this text")
+    assert set(candidates) <= analyze(ciphertext, strategy="batch")
+
+
+if __name__ == "__main__":
+    pytest.main(["-v", __file__])
@@ -7,8 +7,11 @@ Double transposition cipher testing
 """
 
 import importlib
+import os
 import pathlib
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator
 
 import pytest
@@ -19,7 +22,8 @@ try:
 except ModuleNotFoundError:
     sys.path.append(f"{pathlib.Path(__file__).parents[3]}/")
 finally:
-    from src.projects.doubletrans import analyze, decrypt, encrypt
+    from src.projects.doubletrans import Analyzer, analyze, decrypt, encrypt
+    from src.projects.doubletrans import doubletrans_cipher as dt
 
 
 DATA_DIR = pathlib.Path("data/projects/doubletrans/")
@@ -54,6 +58,49 @@ def test_decrypt(plaintext: str, key: tuple[tuple[int, ...], tuple[int, ...]], c
     assert decrypt(ciphertext, key) == plaintext
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, key",
+    get_cases("test_case", "plaintext", "key"),
+)
+def test_encrypt_blocks(plaintext: str, key: tuple[tuple[int, ...], tuple[int, ...]]):
+    """Testing the block-streaming encryption and decryption"""
+    size = len(key[0]) * len(key[1])
+    text = plaintext * 7
+    blocks = [text[i : i + size] for i in range(0, len(text), size)]
+    chunks = [text[i : i + 5] for i in range(0, len(text), 5)]
+    ciphertext = "".join(dt.encrypt_blocks(chunks, key))
+    assert ciphertext == "".join(encrypt(block, key) for block in blocks)
+    assert "".join(dt.decrypt_blocks([ciphertext[i : i + 3] for i in range(0, len(ciphertext), 3)], key)) == text
+    with pytest.raises(ValueError):
+        list(dt.decrypt_blocks([ciphertext[:-1]], key))
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_encrypt_file(tmp_path: pathlib.Path):
+    """Testing the block-streaming file encryption"""
+    key = ((2, 1, 0), (3, 1, 4, 0, 2))
+    text = "attack at dawn\n" * 10_000
+    (tmp_path / "plain.txt").write_text(text, encoding="utf-8")
+    dt.encrypt_file(tmp_path / "plain.txt", tmp_path / "cipher.txt", key)
+    dt.decrypt_file(tmp_path / "cipher.txt", tmp_path / "decrypted.txt", key)
+    assert (tmp_path / "decrypted.txt").read_text(encoding="utf-8") == text
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_encrypt_file_in_place(tmp_path: pathlib.Path):
+    """Testing that a file can be encrypted and decrypted onto itself"""
+    key = ((2, 1, 0), (3, 1, 4, 0, 2))
+    text = "attack at dawn\n" * 1_000
+    file = tmp_path / "message.txt"
+    file.write_text(text, encoding="utf-8")
+    dt.encrypt_file(file, file, key)
+    assert file.read_text(encoding="utf-8") == "".join(dt.encrypt_blocks([text], key))
+    dt.decrypt_file(file, file, key)
+    assert file.read_text(encoding="utf-8") == text
+    assert [path.name for path in tmp_path.iterdir()] == ["message.txt"]
+
+
 @pytest.mark.timeout(TIME_LIMIT)
 # @pytest.mark.skip()
 @pytest.mark.parametrize(
@@ -66,5 +113,119 @@ def test_analyze(ciphertext: str, candidates: set[str]):
         assert analyze(ciphertext) == set(candidates)
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "plaintext, key",
+    get_cases("test_case", "plaintext", "key"),
+)
+def test_search_trie(plaintext: str, key: tuple[tuple[int, ...], tuple[int, ...]]):
+    """Testing that the pruned search finds the same candidates as brute force"""
+    dimensions = (len(key[0]), len(key[1]))
+    if dimensions[0] * dimensions[1] > 20:
+        pytest.skip("brute force is too slow for this grid")
+    ciphertext = encrypt(plaintext, key)
+    found = dt.search_trie(ciphertext, dimensions)
+    assert found == dt.search_permutations(ciphertext, dimensions)
+    assert (plaintext in found) == dt.is_candidate(plaintext)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext, plaintext, key",
+    get_cases("test_case", "ciphertext", "plaintext", "key"),
+)
+def test_search_decomposed(ciphertext: str, plaintext: str, key: tuple[tuple[int, ...], tuple[int, ...]]):
+    """Testing that the decomposed search recovers the plaintext and only finds candidates the full search finds"""
+    dimensions = (len(key[0]), len(key[1]))
+    found = dt.search_decomposed(ciphertext, dimensions)
+    assert (plaintext in found) == dt.is_candidate(plaintext)
+    assert found <= dt.search_trie(ciphertext, dimensions)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext",
+    get_cases("test_case", "ciphertext"),
+)
+def test_iter_analyze(ciphertext: str):
+    """Testing the streaming analysis"""
+    found = list(dt.iter_analyze(ciphertext))
+    assert len(found) == len(set(found))
+    assert set(found) == set(analyze(ciphertext))
+    assert list(dt.iter_analyze(ciphertext, max_candidates=1)) == found[:1]
+    assert list(dt.iter_analyze(ciphertext, deadline=time.perf_counter())) == []
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_analyze_strategy():
+    """Testing the analysis strategies"""
+    assert analyze("NA*DWT  KAATCAT", strategy="decomposed") == {"attack at dawn"}
+    assert analyze("NA*DWT  KAATCAT", strategy="brute") == {"attack at dawn"}
+    with pytest.raises(ValueError):
+        analyze("NA*DWT  KAATCAT", strategy="unknown")
+
+
+@pytest.mark.timeout(TIME_LIMIT * 2)
+@pytest.mark.parametrize("strategy", ["brute", "trie", "decomposed"])
+def test_analyze_parallel(strategy: str):
+    """Testing the parallel analysis"""
+    reported = []
+    for ciphertext, _ in get_cases("test_case", "ciphertext", "key"):
+        if strategy == "brute" and len(ciphertext) > 15:
+            continue
+        reported.clear()
+        expected = analyze(ciphertext, strategy=strategy)
+        assert dt.analyze_parallel(ciphertext, strategy, workers=2, report=reported.append) == expected
+        assert set(reported) == set(expected)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize("strategy", ["trie", "brute"])
+def test_analyzer(strategy: str):
+    """Testing the analysis session"""
+    ciphertexts = [
+        ciphertext
+        for ciphertext, _ in get_cases("test_case", "ciphertext", "key")
+        if strategy == "trie" or len(ciphertext) <= 15
+    ]
+    analyzer = Analyzer(strategy=strategy)
+    expected = [set(analyze(ciphertext, strategy=strategy)) for ciphertext in ciphertexts]
+    assert analyzer.analyze_many(ciphertexts) == expected
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(analyzer.analyze, ciphertexts)) == expected
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_analyzer_word_file(tmp_path: pathlib.Path):
+    """Testing an analysis session with its own dictionary"""
+    word_file = tmp_path / "words"
+    word_file.write_text("attack\ndusk\n", encoding="utf-8")
+    ciphertext = encrypt("attack at dusk", ((2, 1, 0), (3, 1, 4, 0, 2)))
+    assert Analyzer(word_file).analyze(ciphertext) == set()
+    word_file.write_text("attack\nat\ndusk\n", encoding="utf-8")
+    assert Analyzer(word_file, "brute").analyze_many([ciphertext]) == [{"attack at dusk"}]
+    with pytest.raises(ValueError):
+        Analyzer(word_file, "unknown")
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+def test_word_index(tmp_path: pathlib.Path):
+    """Testing the compiled word index"""
+    word_file = tmp_path / "words"
+    word_file.write_text("Hello\nworld\n\nhelp\nworld\n", encoding="utf-8")
+    with dt.open_word_index(word_file) as index:
+        assert list(index) == ["hello", "help", "world"]
+        assert "help" in index and "he" not in index and "zebra" not in index
+        assert index.has_prefix("he") and not index.has_prefix("hx")
+        assert index.words() == dt.load_word_list(word_file)
+
+    word_file.write_text("zebra\n", encoding="utf-8")
+    os.utime(word_file, ns=(0, 0))
+    with pytest.raises(ValueError):
+        dt.WordIndex(dt.index_path(word_file), word_file)
+    with dt.open_word_index(word_file) as index:
+        assert index.words() == {"zebra"}
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
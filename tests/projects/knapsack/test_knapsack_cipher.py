@@ -123,6 +123,36 @@ def test_decrypt(ciphertext, sik, n, m, plaintext):
     assert knapsack.decrypt(ciphertext, sik, n, m) == plaintext
 
 
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "ciphertext, sik, n, m, i, genk, plaintext",
+    get_cases("test_case_basic", "ciphertext", "sik", "n", "m", "i", "genk", "plaintext"),
+)
+def test_private_key(ciphertext, sik, n, m, i, genk, plaintext):
+    """Testing the precomputed private key"""
+    key = knapsack.KnapsackPrivateKey.from_sik(sik, n, m)
+    assert (key.sik, key.n, key.m, key.inverse, key.gk) == (tuple(sik), n, m, i, tuple(genk))
+    assert key.public_key == knapsack.KnapsackPublicKey(tuple(genk))
+    assert knapsack.decrypt(ciphertext, key) == plaintext
+    with pytest.raises(AttributeError):
+        key.n = 0
+    assert not isinstance(key, tuple) and not isinstance(key.public_key, tuple)
+
+
+@pytest.mark.timeout(TIME_LIMIT)
+@pytest.mark.parametrize(
+    "sik, n, m, i",
+    get_cases("test_case_basic", "sik", "default_n", "default_m", "default_i"),
+)
+def test_private_key_default(sik, n, m, i):
+    """Testing the private key with default n and m"""
+    key = knapsack.KnapsackPrivateKey.from_sik(sik)
+    assert (key.n, key.m, key.inverse) == (n, m, i)
+    if len(sik) >= 8:
+        assert knapsack.decrypt(knapsack.encrypt("a", key.public_key), key) == "a"
+        assert knapsack.decrypt(knapsack.encrypt("a", key), sik) == "a"
+
+
 @pytest.mark.timeout(TIME_LIMIT)
 @pytest.mark.parametrize(
     "plaintext, public_file, ciphertext",